@@ -58,8 +58,8 @@ def find_chat_by_display_name(display_name: str) -> tuple[int, str]:
     Raises:
         ValueError: If display name not found or no users found for the chat
     """
-    db = MessagesDatabase()
-    chats = db.get_chats_by_display_name(display_name)
+    with MessagesDatabase() as db:
+        chats = db.get_chats_by_display_name(display_name)
 
     if not chats:
         raise ValueError(f"No chat found with display name '{display_name}'")
@@ -121,7 +121,6 @@ def display_response_options(responses: list[str]) -> int:
 
 
 async def main():
-    db = MessagesDatabase()
     message_service = MessageService(
         MessageConfig(
             require_imessage_enabled=False,  # Use AppleScript
@@ -175,7 +174,8 @@ async def main():
 
     # Get recipient details
     try:
-        phone_number = db.get_user_by_id(user_id).phone_number
+        with MessagesDatabase() as db:
+            phone_number = db.get_user_by_id(user_id).phone_number
     except Exception as e:
         print(f"Error getting recipient details: {e}")
         return 1
@@ -52,54 +52,53 @@ def on_new_messages_received(new_messages: List[Dict[str, Any]], synced_count: i
     print("🚨" * 20)
     
     # Connect to database to get user info
-    messages_db = MessagesDatabase("./data/messages.db")
-    
-    # Show details for each new message
-    for i, msg in enumerate(new_messages[:5], 1):  # Show first 5 messages
-        try:
-            # Get message content
-            content = msg.get("extracted_text") or msg.get("text") or "[No content]"
-            formatted_content = format_message_content(content)
-            
-            # Convert timestamp
+    with MessagesDatabase("./data/messages.db") as messages_db:
+        # Show details for each new message
+        for i, msg in enumerate(new_messages[:5], 1):  # Show first 5 messages
             try:
-                apple_timestamp = msg.get("date", 0)
-                apple_epoch = datetime(2001, 1, 1)
-                timestamp_seconds = apple_timestamp / 1_000_000_000
-                message_time = apple_epoch.timestamp() + timestamp_seconds
-                time_str = datetime.fromtimestamp(message_time).strftime("%I:%M:%S %p")
-            except:
-                time_str = "Unknown time"
+                # Get message content
+                content = msg.get("extracted_text") or msg.get("text") or "[No content]"
+                formatted_content = format_message_content(content)
             
-            # Determine sender
-            if msg.get("is_from_me"):
-                sender = "📤 You"
-            else:
-                # Try to resolve handle_id to user name
-                handle_id = msg.get("handle_id")
-                if handle_id:
-                    # Look up in our database first
-                    try:
-                        user = messages_db.get_user_by_handle_id(handle_id)
-                        if user and (user.first_name or user.last_name):
-                            sender = f"📥 {user.first_name} {user.last_name}".strip()
-                        elif user and user.phone_number:
-                            sender = f"📥 {user.phone_number}"
-                        elif user and user.email:
-                            sender = f"📥 {user.email}"
-                        else:
-                            sender = f"📥 Handle {handle_id}"
-                    except:
-                        sender = f"📥 Handle {handle_id}"
+                # Convert timestamp
+                try:
+                    apple_timestamp = msg.get("date", 0)
+                    apple_epoch = datetime(2001, 1, 1)
+                    timestamp_seconds = apple_timestamp / 1_000_000_000
+                    message_time = apple_epoch.timestamp() + timestamp_seconds
+                    time_str = datetime.fromtimestamp(message_time).strftime("%I:%M:%S %p")
+                except:
+                    time_str = "Unknown time"
+            
+                # Determine sender
+                if msg.get("is_from_me"):
+                    sender = "📤 You"
                 else:
-                    sender = "📥 Unknown"
+                    # Try to resolve handle_id to user name
+                    handle_id = msg.get("handle_id")
+                    if handle_id:
+                        # Look up in our database first
+                        try:
+                            user = messages_db.get_user_by_handle_id(handle_id)
+                            if user and (user.first_name or user.last_name):
+                                sender = f"📥 {user.first_name} {user.last_name}".strip()
+                            elif user and user.phone_number:
+                                sender = f"📥 {user.phone_number}"
+                            elif user and user.email:
+                                sender = f"📥 {user.email}"
+                            else:
+                                sender = f"📥 Handle {handle_id}"
+                        except:
+                            sender = f"📥 Handle {handle_id}"
+                    else:
+                        sender = "📥 Unknown"
             
-            print(f"\n  {i}. {sender} at {time_str}")
-            print(f"     💬 {formatted_content}")
-            print(f"     🆔 ROWID: {msg.get('rowid', 'N/A')}")
+                print(f"\n  {i}. {sender} at {time_str}")
+                print(f"     💬 {formatted_content}")
+                print(f"     🆔 ROWID: {msg.get('rowid', 'N/A')}")
             
-        except Exception as e:
-            print(f"  {i}. Error displaying message: {e}")
+            except Exception as e:
+                print(f"  {i}. Error displaying message: {e}")
     
     if len(new_messages) > 5:
         print(f"\n  ... and {len(new_messages) - 5} more messages")
@@ -127,6 +126,7 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
+    polling_service = None
     try:
         # Initialize polling service
         print("🔧 Initializing polling service...")
@@ -182,6 +182,8 @@ def main():
         print(f"\n❌ Error: {e}")
         logger.error(f"Error in main: {e}")
     finally:
+        if polling_service is not None:
+            polling_service.close()
         print("👋 iMessage polling stopped. Goodbye!")
 
 
@@ -48,32 +48,31 @@ def get_current_max_rowid() -> int:
 def reset_polling_state(new_rowid: int) -> bool:
     """Reset the polling state to the specified ROWID"""
     try:
-        messages_db = MessagesDatabase("./data/messages.db")
-        
-        # Get current state
-        current_state = messages_db.get_polling_state()
-        if not current_state:
-            logger.error("No polling state found")
-            return False
+        with MessagesDatabase("./data/messages.db") as messages_db:
+            # Get current state
+            current_state = messages_db.get_polling_state()
+            if not current_state:
+                logger.error("No polling state found")
+                return False
             
-        old_rowid = current_state["last_processed_rowid"]
+            old_rowid = current_state["last_processed_rowid"]
         
-        # Update polling state
-        success = messages_db.update_polling_state(
-            last_processed_rowid=new_rowid,
-            messages_processed_count=0,  # Reset counter since we're skipping
-            sync_status="idle"
-        )
+            # Update polling state
+            success = messages_db.update_polling_state(
+                last_processed_rowid=new_rowid,
+                messages_processed_count=0,  # Reset counter since we're skipping
+                sync_status="idle"
+            )
         
-        if success:
-            logger.info(f"✅ Polling state updated:")
-            logger.info(f"   Old ROWID: {old_rowid}")
-            logger.info(f"   New ROWID: {new_rowid}")
-            logger.info(f"   Skipped: {new_rowid - old_rowid} messages")
-            return True
-        else:
-            logger.error("Failed to update polling state")
-            return False
+            if success:
+                logger.info(f"✅ Polling state updated:")
+                logger.info(f"   Old ROWID: {old_rowid}")
+                logger.info(f"   New ROWID: {new_rowid}")
+                logger.info(f"   Skipped: {new_rowid - old_rowid} messages")
+                return True
+            else:
+                logger.error("Failed to update polling state")
+                return False
             
     except Exception as e:
         logger.error(f"Error resetting polling state: {e}")
@@ -104,8 +103,8 @@ def main():
     
     # Show current polling state
     print("\n📋 Current polling state:")
-    messages_db = MessagesDatabase("./data/messages.db")
-    current_state = messages_db.get_polling_state()
+    with MessagesDatabase("./data/messages.db") as messages_db:
+        current_state = messages_db.get_polling_state()
     
     if current_state:
         old_rowid = current_state['last_processed_rowid']
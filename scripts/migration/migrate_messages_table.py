@@ -9,27 +9,127 @@ This script:
 4. Populates the new messages table with coalesced text content
 
 Usage:
-    python scripts/migration/migrate_messages_table.py
+    python scripts/migration/migrate_messages_table.py          # smoke run (first 1000)
+    python scripts/migration/migrate_messages_table.py --full   # migrate everything
 """
 
+import argparse
 import sys
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
-# Add src to path for imports
-src_path = str(Path(__file__).parent.parent.parent / "src")
-if src_path not in sys.path:
-    sys.path.append(src_path)
+# Add the project root to path so imports resolve to the same src.* modules
+# the rest of the codebase (and the tests) use
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
-from database.manager import DatabaseManager
-from database.messages_db import MessagesDatabase
-from messaging.decoder import extract_message_text
-from utils.logger_config import get_logger
+from src.database.manager import DatabaseManager
+from src.database.messages_db import MessageRow, MessagesDatabase
+from src.messaging.decoder import extract_message_text
+from src.utils.logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# Rows fetched from the source database per round trip during extraction
+EXTRACT_FETCH_SIZE = 1000
+
+# Messages migrated by a default (non --full) run, kept small for quick checks
+SMOKE_TEST_LIMIT = 1000
+
+# Characters str.strip() removes, so SQL-side trimming matches Python's
+_WHITESPACE_SQL = (
+    "char(9, 10, 11, 12, 13, 28, 29, 30, 31, 32, 133, 160, 5760, 8192, 8193, "
+    "8194, 8195, 8196, 8197, 8198, 8199, 8200, 8201, 8202, 8232, 8233, 8239, "
+    "8287, 12288)"
+)
+_TRIMMED_TEXT_SQL = f"trim(m.text, {_WHITESPACE_SQL})"
+_HAS_TEXT_SQL = f"COALESCE(length({_TRIMMED_TEXT_SQL}), 0) > 0"
+
+# Copy messages that already have text straight from the attached source
+# database; user_id follows MessagesTableMigrator._map_handle_to_user_id
+_MIGRATE_TEXT_MESSAGES_SQL = f"""
+    INSERT OR IGNORE INTO messages (message_id, user_id, contents, is_from_me, created_at)
+    SELECT
+        m.ROWID,
+        CASE
+            WHEN m.handle_id IS NULL THEN 'unknown_user_none'
+            ELSE COALESCE(
+                (SELECT u.user_id FROM users u WHERE u.handle_id = m.handle_id LIMIT 1),
+                'unknown_user_' || m.handle_id
+            )
+        END,
+        {_TRIMMED_TEXT_SQL},
+        COALESCE(m.is_from_me, 0) != 0,
+        mac_timestamp_to_iso(m.date)
+    FROM src.message m
+    WHERE {_HAS_TEXT_SQL}
+"""
+
+
+def _extract_messages_sql(where: str) -> str:
+    """Build a message extraction query for the given WHERE condition
+
+    Rows with usable text come back with trimmed text only; attributedBody
+    is fetched (and decoded) only for rows that need it. Pass -1 as the
+    LIMIT parameter for no limit.
+    """
+    return f"""
+        SELECT 
+            m.ROWID as message_id,
+            CASE WHEN {_HAS_TEXT_SQL}
+                 THEN {_TRIMMED_TEXT_SQL} END as fast_text,
+            CASE WHEN {_HAS_TEXT_SQL}
+                 THEN NULL ELSE m.attributedBody END as attributedBody,
+            m.handle_id,
+            m.is_from_me,
+            m.date,
+            h.id as handle_identifier
+        FROM message m
+        LEFT JOIN handle h ON m.handle_id = h.ROWID
+        WHERE {where}
+        ORDER BY m.date DESC
+        LIMIT ?
+    """
+
+
+# Built once so every extraction reuses identical SQL text, which keeps
+# sqlite3's per-connection statement cache effective
+_EXTRACT_MESSAGES_SQL = _extract_messages_sql(
+    f"{_HAS_TEXT_SQL} OR m.attributedBody IS NOT NULL"
+)
+_EXTRACT_ATTRIBUTED_BODY_MESSAGES_SQL = _extract_messages_sql(
+    f"NOT {_HAS_TEXT_SQL} AND m.attributedBody IS NOT NULL"
+)
+
+
+def _mac_timestamp_to_iso(date: Optional[int]) -> str:
+    """
+    Convert a Messages date to a local ISO timestamp
+
+    Args:
+        date: Nanoseconds since 2001-01-01, as stored in chat.db
+
+    Returns:
+        ISO formatted timestamp, or the current time if date is missing or invalid
+    """
+    if date:
+        try:
+            # Convert nanoseconds to seconds since 2001-01-01
+            seconds_since_2001 = date / 1_000_000_000
+            # Add offset from 2001-01-01 to 1970-01-01 (Unix epoch)
+            unix_timestamp = seconds_since_2001 + 978307200
+            # Validate timestamp is reasonable (between 1970 and 2100)
+            if 0 <= unix_timestamp <= 4102444800:  # 2100-01-01
+                return datetime.fromtimestamp(unix_timestamp).isoformat()
+        except (OSError, ValueError, OverflowError):
+            # Handle invalid timestamp values
+            pass
+    # Use current time for missing or invalid timestamps
+    return datetime.now().isoformat()
+
 
 class MessagesTableMigrator:
     """Migrator for creating and populating the new messages table"""
@@ -44,6 +144,10 @@ class MessagesTableMigrator:
         # Don't use DatabaseManager for migration - just access the database directly
         self.messages_db = MessagesDatabase(str(self.target_db_path))
 
+    def close(self) -> None:
+        """Close the target database connection"""
+        self.messages_db.close()
+
     def validate_source_database(self) -> bool:
         """
         Validate that the source database exists and has required tables
@@ -78,50 +182,44 @@ class MessagesTableMigrator:
             logger.error(f"Error validating source database: {e}")
             return False
 
-    def extract_messages_with_text(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def extract_messages_with_text(
+        self, limit: Optional[int] = None, attributed_body_only: bool = False
+    ) -> List[MessageRow]:
         """
         Extract messages from source database with decoded text
 
         Args:
             limit: Optional limit on number of messages to extract
+            attributed_body_only: Only extract messages without plain text,
+                i.e. those whose text must be decoded from attributedBody
 
         Returns:
-            List of message dictionaries with decoded text
+            List of MessageRow tuples with decoded text
         """
         try:
             with sqlite3.connect(str(self.source_db_path)) as conn:
                 cursor = conn.cursor()
 
-                # Query to get messages with handle information
-                query = """
-                    SELECT 
-                        m.ROWID as message_id,
-                        m.text,
-                        m.attributedBody,
-                        m.handle_id,
-                        m.is_from_me,
-                        m.date,
-                        h.id as handle_identifier
-                    FROM message m
-                    LEFT JOIN handle h ON m.handle_id = h.ROWID
-                    WHERE m.text IS NOT NULL OR m.attributedBody IS NOT NULL
-                    ORDER BY m.date DESC
-                """
-
-                if limit:
-                    query += f" LIMIT {limit}"
-
-                cursor.execute(query)
-                raw_messages = cursor.fetchall()
-
-                logger.info(f"Extracted {len(raw_messages)} raw messages from source database")
+                # Query to get messages with handle information; rows with
+                # neither text nor attributedBody are filtered out in SQL
+                query = (
+                    _EXTRACT_ATTRIBUTED_BODY_MESSAGES_SQL
+                    if attributed_body_only
+                    else _EXTRACT_MESSAGES_SQL
+                )
+                cursor.execute(query, (limit if limit else -1,))
+                # Stream source rows rather than holding every raw row
+                # (including attributedBody blobs) in memory at once
+                cursor.arraysize = EXTRACT_FETCH_SIZE
 
                 # Process messages and decode text
                 messages = []
-                for row in raw_messages:
+                raw_count = 0
+                for row in cursor:
+                    raw_count += 1
                     (
                         message_id,
-                        text,
+                        fast_text,
                         attributed_body,
                         handle_id,
                         is_from_me,
@@ -129,46 +227,33 @@ class MessagesTableMigrator:
                         handle_identifier,
                     ) = row
 
-                    # Decode message text using the messaging decoder
-                    decoded_text = extract_message_text(text, attributed_body)
+                    # Only decode attributedBody when there is no plain text
+                    if fast_text is not None:
+                        decoded_text = fast_text
+                    else:
+                        decoded_text = extract_message_text(None, attributed_body)
 
                     # Skip messages without any text content
                     if not decoded_text or decoded_text.strip() == "":
                         continue
 
                     # Convert macOS timestamp to ISO format
-                    # macOS uses nanoseconds since 2001-01-01, convert to Unix timestamp
-                    if date:
-                        try:
-                            # Convert nanoseconds to seconds since 2001-01-01
-                            seconds_since_2001 = date / 1_000_000_000
-                            # Add offset from 2001-01-01 to 1970-01-01 (Unix epoch)
-                            unix_timestamp = seconds_since_2001 + 978307200
-                            # Validate timestamp is reasonable (between 1970 and 2100)
-                            if 0 <= unix_timestamp <= 4102444800:  # 2100-01-01
-                                created_at = datetime.fromtimestamp(unix_timestamp).isoformat()
-                            else:
-                                # Use current time for invalid timestamps
-                                created_at = datetime.now().isoformat()
-                        except (OSError, ValueError, OverflowError):
-                            # Handle invalid timestamp values
-                            created_at = datetime.now().isoformat()
-                    else:
-                        created_at = datetime.now().isoformat()
+                    created_at = _mac_timestamp_to_iso(date)
 
                     # Map handle_id to our user_id from the users table
                     user_id = self._map_handle_to_user_id(handle_id)
 
-                    message_data = {
-                        "message_id": int(message_id),
-                        "user_id": user_id,
-                        "contents": decoded_text,
-                        "is_from_me": bool(is_from_me),
-                        "created_at": created_at,
-                    }
-
-                    messages.append(message_data)
+                    messages.append(
+                        MessageRow(
+                            message_id=int(message_id),
+                            user_id=user_id,
+                            contents=decoded_text,
+                            is_from_me=bool(is_from_me),
+                            created_at=created_at,
+                        )
+                    )
 
+                logger.info(f"Extracted {raw_count} raw messages from source database")
                 logger.info(f"Successfully processed {len(messages)} messages with decoded text")
                 return messages
 
@@ -176,6 +261,24 @@ class MessagesTableMigrator:
             logger.error(f"Error extracting messages from source database: {e}")
             return []
 
+    def extract_columns(self, limit: Optional[int] = None) -> Dict[str, List[Any]]:
+        """
+        Extract messages as parallel column lists, e.g. for pandas or Arrow
+
+        Args:
+            limit: Optional limit on number of messages to extract
+
+        Returns:
+            Dictionary mapping each MessageRow field to a list of values
+        """
+        messages = self.extract_messages_with_text(limit=limit)
+        if not messages:
+            return {field: [] for field in MessageRow._fields}
+        return {
+            field: list(column)
+            for field, column in zip(MessageRow._fields, zip(*messages))
+        }
+
     def _map_handle_to_user_id(self, handle_id: Optional[int]) -> str:
         """
         Map a handle_id from the Messages database to our user_id
@@ -201,6 +304,34 @@ class MessagesTableMigrator:
             logger.warning(f"Error mapping handle_id {handle_id} to user_id: {e}")
             return f"unknown_user_{handle_id}"
 
+    def _migrate_text_messages_in_sql(self) -> int:
+        """
+        Copy messages that already have text from source to target in SQL
+
+        The source database is attached to the target connection so rows
+        move between the two files without being built as Python objects.
+
+        Returns:
+            Number of messages inserted
+        """
+        with self.messages_db._connect() as conn:
+            conn.create_function("mac_timestamp_to_iso", 1, _mac_timestamp_to_iso)
+            conn.execute("ATTACH DATABASE ? AS src", (str(self.source_db_path),))
+            try:
+                inserted_count = conn.execute(_MIGRATE_TEXT_MESSAGES_SQL).rowcount
+                conn.commit()
+            except Exception:
+                # End the failed INSERT's transaction, or DETACH fails with
+                # "database src is locked" and hides this error
+                conn.rollback()
+                raise
+            finally:
+                # The connection is reused, so src must not stay attached
+                conn.execute("DETACH DATABASE src")
+
+        logger.info(f"Copied {inserted_count} text messages directly in SQL")
+        return inserted_count
+
     def migrate_messages(self, batch_size: int = 1000, limit: Optional[int] = None) -> bool:
         """
         Migrate messages from source to target database
@@ -225,16 +356,24 @@ class MessagesTableMigrator:
             # Clear existing messages if any
             self.messages_db.clear_messages_table()
 
+            # Without a limit, messages that already have text are copied
+            # in SQL and only attributedBody messages go through Python;
+            # a limit has to pick the newest messages of either kind
+            total_inserted = 0
+            if limit is None:
+                total_inserted = self._migrate_text_messages_in_sql()
+
             # Extract messages with decoded text
             logger.info("Extracting messages from source database...")
-            messages = self.extract_messages_with_text(limit=limit)
+            messages = self.extract_messages_with_text(
+                limit=limit, attributed_body_only=limit is None
+            )
 
-            if not messages:
+            if not messages and not total_inserted:
                 logger.warning("No messages found to migrate")
                 return True
 
             # Insert messages in batches
-            total_inserted = 0
             for i in range(0, len(messages), batch_size):
                 batch = messages[i : i + batch_size]
                 inserted_count = self.messages_db.insert_messages_batch(batch)
@@ -447,10 +586,15 @@ class MessagesTableMigrator:
             logger.error(f"Error during chats migration: {e}")
             return False
 
-    def get_migration_stats(self) -> Dict[str, Any]:
+    def get_migration_stats(self, count_target_messages: bool = False) -> Dict[str, Any]:
         """
         Get statistics about the migration
 
+        Args:
+            count_target_messages: Also report the exact number of messages in
+                the target database. Off by default since it scans the table;
+                "has_messages" is always reported.
+
         Returns:
             Dictionary with migration statistics
         """
@@ -471,11 +615,14 @@ class MessagesTableMigrator:
                     source_stats["messages_with_text"] = cursor.fetchone()[0]
 
             # Target database stats
-            target_stats = {"total_messages": 0}
+            target_stats = {"has_messages": False}
+            if count_target_messages:
+                target_stats["total_messages"] = 0
             
             if self.target_db_path.exists():
-                target_messages = self.messages_db.get_all_messages()
-                target_stats["total_messages"] = len(target_messages)
+                target_stats["has_messages"] = self.messages_db.has_messages()
+                if count_target_messages:
+                    target_stats["total_messages"] = self.messages_db.count_messages()
 
             return {
                 "source_database": str(self.source_db_path),
@@ -490,24 +637,47 @@ class MessagesTableMigrator:
             return {"error": str(e)}
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function to run the messages table migration"""
+    parser = argparse.ArgumentParser(
+        description="Create and populate the messages table"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Migrate all messages instead of the default smoke-test slice",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=SMOKE_TEST_LIMIT,
+        help=f"Number of messages to migrate without --full (default: {SMOKE_TEST_LIMIT})",
+    )
+    args = parser.parse_args(argv)
+    limit = None if args.full else args.limit
+
     logger.info("Starting messages table migration...")
 
     # Initialize migrator
     migrator = MessagesTableMigrator()
 
-    # Get pre-migration stats
-    pre_stats = migrator.get_migration_stats()
-    logger.info(f"Pre-migration stats: {pre_stats}")
-
-    # Run migration
-    # For testing, limit to 1000 messages initially
-    success = migrator.migrate_messages(batch_size=500, limit=1000)
-
-    # Get post-migration stats
-    post_stats = migrator.get_migration_stats()
-    logger.info(f"Post-migration stats: {post_stats}")
+    try:
+        # Get pre-migration stats
+        pre_stats = migrator.get_migration_stats(count_target_messages=True)
+        logger.info(f"Pre-migration stats: {pre_stats}")
+
+        # Run migration; without --full only a smoke-test slice is migrated
+        if limit is None:
+            logger.info("Running full migration")
+        else:
+            logger.info(f"Migrating first {limit} messages (pass --full for all)")
+        success = migrator.migrate_messages(batch_size=500, limit=limit)
+
+        # Get post-migration stats
+        post_stats = migrator.get_migration_stats(count_target_messages=True)
+        logger.info(f"Post-migration stats: {post_stats}")
+    finally:
+        migrator.close()
 
     if success:
         logger.info("Messages table migration completed successfully!")
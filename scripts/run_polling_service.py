@@ -94,6 +94,9 @@ def run_single_poll(data_dir: str, batch_size: int) -> bool:
     except Exception as e:
         print(f"❌ Error during single poll: {e}")
         return False
+    finally:
+        if 'polling_service' in locals():
+            polling_service.close()
 
 
 def format_message_content(content: str, max_length: int = 80) -> str:
@@ -234,16 +237,16 @@ def show_current_status(data_dir: str):
             return
         
         print_status(polling_service)
+        polling_service.close()
         
         # Show database statistics
         from src.database.messages_db import MessagesDatabase
-        messages_db = MessagesDatabase(str(messages_db_path))
-        
-        if messages_db.database_exists():
-            stats = messages_db.get_database_stats()
-            print(f"\nDatabase Statistics:")
-            print(f"  Users: {stats.get('total_users', 'N/A')}")
-            print(f"  Database Size: {stats.get('database_size_bytes', 0) / 1024:.1f} KB")
+        with MessagesDatabase(str(messages_db_path)) as messages_db:
+            if messages_db.database_exists():
+                stats = messages_db.get_database_stats()
+                print(f"\nDatabase Statistics:")
+                print(f"  Users: {stats.get('total_users', 'N/A')}")
+                print(f"  Database Size: {stats.get('database_size_bytes', 0) / 1024:.1f} KB")
         
     except Exception as e:
         print(f"❌ Error showing status: {e}")
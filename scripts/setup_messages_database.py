@@ -418,13 +418,13 @@ def populate_database_content(messages_db: MessagesDatabase, chat_db_path: str)
     """
     logger.info("Starting database content population...")
     
+    # Initialize the migrator
+    migrator = MessagesTableMigrator(
+        source_db_path=chat_db_path,
+        target_db_path=str(messages_db.db_path)
+    )
+    
     try:
-        # Initialize the migrator
-        migrator = MessagesTableMigrator(
-            source_db_path=chat_db_path,
-            target_db_path=str(messages_db.db_path)
-        )
-        
         # Get pre-migration stats
         pre_stats = migrator.get_migration_stats()
         logger.info(f"Pre-migration: {pre_stats['source_stats']['messages_with_text']} messages with text in source")
@@ -454,7 +454,7 @@ def populate_database_content(messages_db: MessagesDatabase, chat_db_path: str)
             return {"error": "Chat-message migration failed"}
         
         # Get post-migration stats
-        post_stats = migrator.get_migration_stats()
+        post_stats = migrator.get_migration_stats(count_target_messages=True)
         messages_migrated = post_stats['target_stats']['total_messages']
         
         # Get counts
@@ -476,6 +476,8 @@ def populate_database_content(messages_db: MessagesDatabase, chat_db_path: str)
     except Exception as e:
         logger.error(f"Error during database content population: {e}")
         return {"error": str(e)}
+    finally:
+        migrator.close()
 
 
 def validate_test_cases(messages_db: MessagesDatabase) -> Dict[str, bool]:
@@ -538,8 +540,22 @@ def main():
     
     # Initialize messages database
     print("\n1. Creating messages database...")
-    messages_db = MessagesDatabase(db_path)
+    with MessagesDatabase(db_path) as messages_db:
+        return build_messages_database(messages_db, db_path, chat_db_path)
+
+
+def build_messages_database(messages_db: MessagesDatabase, db_path: str, chat_db_path: str) -> bool:
+    """
+    Create and populate the messages database from the Messages database copy
     
+    Args:
+        messages_db: MessagesDatabase instance for db_path
+        db_path: Path to the messages database
+        chat_db_path: Path to the Messages database copy
+        
+    Returns:
+        True if the setup completed and all test cases passed
+    """
     if not messages_db.create_database():
         print("❌ Failed to create messages database")
         return False
@@ -586,7 +602,10 @@ def main():
     
     # Initialize handle matcher and process handles
     handle_matcher = HandleMatcher(db_path)
-    process_stats = process_handles(messages_db, handle_matcher, handles)
+    try:
+        process_stats = process_handles(messages_db, handle_matcher, handles)
+    finally:
+        handle_matcher.close()
     
     if "error" in process_stats:
         print(f"❌ Error processing handles: {process_stats['error']}")
@@ -52,6 +52,7 @@ class ChatHistoryValidator:
 
     def cleanup(self):
         """Clean up temporary resources."""
+        self.messages_db.close()
         try:
             Path(self.db_path).unlink(missing_ok=True)
         except Exception as e:
@@ -108,9 +109,9 @@ class ChatHistoryValidator:
                 }
             ]
 
-            for chat in test_chats:
-                if not self.messages_db.insert_chat(**chat):
-                    raise Exception(f"Failed to insert chat {chat['chat_id']}")
+            # One transaction for all chats and their participants
+            if self.messages_db.insert_chats_batch(test_chats) != len(test_chats):
+                raise Exception("Failed to insert test chats")
 
             # Create realistic message data
             self._create_realistic_message_data()
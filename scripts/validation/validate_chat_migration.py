@@ -27,6 +27,10 @@ class ChatMigrationValidator:
         self.target_db_path = Path(target_db_path)
         self.messages_db = MessagesDatabase(str(target_db_path))
 
+    def close(self) -> None:
+        """Close the target database connection"""
+        self.messages_db.close()
+
     def validate_quantabes_chat(self) -> bool:
         """
         Validate that Quantabes chat contains John Wang and Eric Mueller
@@ -314,7 +318,10 @@ def main():
     validator = ChatMigrationValidator()
 
     # Run full validation
-    success = validator.run_full_validation()
+    try:
+        success = validator.run_full_validation()
+    finally:
+        validator.close()
 
     if success:
         logger.info("Chat migration validation completed successfully!")
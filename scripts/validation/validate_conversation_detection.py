@@ -277,7 +277,10 @@ def main():
     
     # Run validation
     validator = ConversationDetectionValidator(db_path)
-    validator.run_validation()
+    try:
+        validator.run_validation()
+    finally:
+        validator.db.close()
 
 
 if __name__ == "__main__":
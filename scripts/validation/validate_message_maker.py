@@ -44,8 +44,8 @@ def find_chat_by_display_name(display_name: str) -> tuple[int, str]:
     Raises:
         ValueError: If display name not found or no users found for the chat
     """
-    db = MessagesDatabase()
-    chats = db.get_chats_by_display_name(display_name)
+    with MessagesDatabase() as db:
+        chats = db.get_chats_by_display_name(display_name)
     
     if not chats:
         raise ValueError(f"No chat found with display name '{display_name}'")
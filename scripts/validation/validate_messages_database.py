@@ -19,27 +19,26 @@ def validate_database_structure():
     print("=== Validating Database Structure ===")
 
     db_path = "./data/messages.db"
-    messages_db = MessagesDatabase(db_path)
-
-    # Check database exists
-    if not messages_db.database_exists():
-        print("❌ Messages database does not exist")
-        return False
+    with MessagesDatabase(db_path) as messages_db:
+        # Check database exists
+        if not messages_db.database_exists():
+            print("❌ Messages database does not exist")
+            return False
 
-    print("✅ Messages database exists")
+        print("✅ Messages database exists")
 
-    # Check users table exists
-    if not messages_db.table_exists("users"):
-        print("❌ Users table does not exist")
-        return False
+        # Check users table exists
+        if not messages_db.table_exists("users"):
+            print("❌ Users table does not exist")
+            return False
 
-    print("✅ Users table exists")
+        print("✅ Users table exists")
 
-    # Validate table schema
-    schema = messages_db.get_table_schema("users")
-    if not schema:
-        print("❌ Could not retrieve users table schema")
-        return False
+        # Validate table schema
+        schema = messages_db.get_table_schema("users")
+        if not schema:
+            print("❌ Could not retrieve users table schema")
+            return False
 
     # Check required columns
     column_names = [col[1] for col in schema]
@@ -93,30 +92,30 @@ def validate_users_data():
     print("\n=== Validating Users Data ===")
 
     db_path = "./data/messages.db"
-    messages_db = MessagesDatabase(db_path)
+    with MessagesDatabase(db_path) as messages_db:
+        # Get database statistics
+        stats = messages_db.get_database_stats()
+        if "error" in stats:
+            print(f"❌ Error getting database stats: {stats['error']}")
+            return False
 
-    # Get database statistics
-    stats = messages_db.get_database_stats()
-    if "error" in stats:
-        print(f"❌ Error getting database stats: {stats['error']}")
-        return False
+        total_users = stats["total_users"]
+        users_with_phone = stats["users_with_phone"]
+        users_with_email = stats["users_with_email"]
 
-    total_users = stats["total_users"]
-    users_with_phone = stats["users_with_phone"]
-    users_with_email = stats["users_with_email"]
+        print(f"📊 Database contains {total_users} users")
+        print(f"   - Users with phone: {users_with_phone}")
+        print(f"   - Users with email: {users_with_email}")
 
-    print(f"📊 Database contains {total_users} users")
-    print(f"   - Users with phone: {users_with_phone}")
-    print(f"   - Users with email: {users_with_email}")
+        if total_users == 0:
+            print("❌ No users found in database")
+            return False
 
-    if total_users == 0:
-        print("❌ No users found in database")
-        return False
+        print("✅ Database contains users")
 
-    print("✅ Database contains users")
+        # Validate a sample of users
+        sample_users = messages_db.get_all_users(limit=10)
 
-    # Validate a sample of users
-    sample_users = messages_db.get_all_users(limit=10)
     print(f"\n📝 Validating sample of {len(sample_users)} users:")
 
     for i, user in enumerate(sample_users, 1):
@@ -198,8 +197,8 @@ def validate_data_consistency():
     addressbook_users = extractor.extract_users()
 
     # Get users from database
-    messages_db = MessagesDatabase("./data/messages.db")
-    database_users = messages_db.get_all_users()
+    with MessagesDatabase("./data/messages.db") as messages_db:
+        database_users = messages_db.get_all_users()
 
     print(f"📊 Data consistency check:")
     print(f"   - Address book users: {len(addressbook_users)}")
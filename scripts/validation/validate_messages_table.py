@@ -51,6 +51,10 @@ class MessagesTableValidator:
             "validation_time": datetime.now().isoformat(),
         }
 
+    def close(self) -> None:
+        """Close the target database connection"""
+        self.messages_db.close()
+
     def validate_schema(self) -> Dict[str, Any]:
         """
         Validate the messages table schema
@@ -401,8 +405,7 @@ class MessagesTableValidator:
                 return results
 
             # Count messages in target
-            target_messages = self.messages_db.get_all_messages()
-            results["target_message_count"] = len(target_messages)
+            results["target_message_count"] = self.messages_db.count_messages()
 
             # Count messages in source
             with sqlite3.connect(str(self.source_db_path)) as conn:
@@ -574,12 +577,15 @@ def main():
     # Initialize validator
     validator = MessagesTableValidator()
 
-    # Run full validation
-    results = validator.run_full_validation()
+    try:
+        # Run full validation
+        results = validator.run_full_validation()
 
-    # Generate and display report
-    report = validator.generate_validation_report()
-    print(report)
+        # Generate and display report
+        report = validator.generate_validation_report()
+        print(report)
+    finally:
+        validator.close()
 
     # Log detailed results
     logger.info(f"Detailed validation results: {results}")
@@ -18,7 +18,6 @@ from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
 
 from src.database.polling_service import MessagePollingService
-from src.database.messages_db import MessagesDatabase
 from src.database.manager import DatabaseManager
 from src.utils.logger_config import get_logger
 
@@ -165,7 +164,7 @@ class PollingServiceValidator:
             logger.info(f"✓ Service initialized successfully in {init_time:.3f}s")
             
             # Check database structure
-            messages_db = MessagesDatabase(f"{self.test_dir}/messages.db")
+            messages_db = self.polling_service.messages_db
             
             required_tables = ["users", "chats", "messages", "chat_messages", "polling_state"]
             for table in required_tables:
@@ -238,7 +237,7 @@ class PollingServiceValidator:
         logger.info("=== Validating Incremental Sync ===")
         
         try:
-            messages_db = MessagesDatabase(f"{self.test_dir}/messages.db")
+            messages_db = self.polling_service.messages_db
             
             # Get initial state
             initial_state = messages_db.get_polling_state()
@@ -336,7 +335,7 @@ class PollingServiceValidator:
         logger.info("=== Validating User Resolution ===")
         
         try:
-            messages_db = MessagesDatabase(f"{self.test_dir}/messages.db")
+            messages_db = self.polling_service.messages_db
             
             # Check how many users were created
             users = messages_db.get_all_users()
@@ -453,6 +452,7 @@ class PollingServiceValidator:
                 
             finally:
                 DatabaseManager.create_safe_copy = original_create_safe_copy
+                large_polling_service.close()
                 
         except Exception as e:
             logger.error(f"Performance validation failed: {e}")
@@ -513,6 +513,8 @@ class PollingServiceValidator:
                 
             finally:
                 # Restore permissions and cleanup
+                if 'error_polling_service' in locals():
+                    error_polling_service.close()
                 try:
                     os.chmod(restricted_subdir, stat.S_IWRITE | stat.S_IREAD | stat.S_IEXEC)
                     import shutil
@@ -527,6 +529,8 @@ class PollingServiceValidator:
     
     def cleanup(self):
         """Clean up test environment"""
+        if self.polling_service:
+            self.polling_service.close()
         if self.test_dir:
             import shutil
             shutil.rmtree(self.test_dir, ignore_errors=True)
@@ -7,7 +7,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-from src.messaging.decoder import MessageDecoder, extract_message_text
+from src.messaging.decoder import MessageDecoder, extract_message_text_batch
 
 logger = logging.getLogger(__name__)
 
@@ -179,19 +179,20 @@ class MessageMigration:
                     f"Processing batch {batch_count}, messages {i+1}-{min(i+batch_size, total_to_migrate)}"
                 )
 
-                # Process each message in the batch
-                updates = []
-                for rowid, text, attributed_body in batch:
-                    # Extract text
-                    extracted_text = extract_message_text(text, attributed_body)
-
-                    if extracted_text:
-                        updates.append((extracted_text, rowid))
-                        successful_extractions += 1
-                    else:
-                        failed_extractions += 1
+                # Decode the whole batch with the migration's decoder
+                extracted_texts = extract_message_text_batch(
+                    ((text, attributed_body) for _, text, attributed_body in batch),
+                    decoder=self.decoder,
+                )
 
-                    processed += 1
+                updates = [
+                    (extracted_text, rowid)
+                    for (rowid, _, _), extracted_text in zip(batch, extracted_texts)
+                    if extracted_text
+                ]
+                successful_extractions += len(updates)
+                failed_extractions += len(batch) - len(updates)
+                processed += len(batch)
 
                 # Batch update extracted_text
                 if updates:
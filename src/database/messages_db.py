@@ -1,14 +1,55 @@
 """Messages Database Manager - Creates and manages the new messages.db"""
 
 import sqlite3
+import threading
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
 
 from src.user.user import User
 from src.utils.logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# Let SQLite memory-map up to 256 MiB of the database file on each connection
+MMAP_SIZE = 268435456
+
+# Bound parameters per statement, below the 999 limit of older SQLite builds
+SQLITE_MAX_PARAMS = 900
+
+# Chats with a display name, most messages first. The counts come from the
+# (chat_id, message_id) primary key index of chat_messages, without touching
+# its rows or the messages table
+CHATS_BY_DISPLAY_NAME_SQL = """
+    SELECT c.chat_id, c.display_name, COALESCE(COUNT(cm.message_id), 0) as message_count
+    FROM chats c
+    LEFT JOIN chat_messages cm ON c.chat_id = cm.chat_id
+    WHERE c.display_name = ?
+    GROUP BY c.chat_id, c.display_name
+    ORDER BY message_count DESC, c.chat_id
+"""
+
+
+class MessageRow(NamedTuple):
+    """A row of the messages table, in column order
+
+    Supports ``row["contents"]`` as well as ``row.contents`` so it can be
+    passed anywhere a message dictionary was accepted.
+    """
+
+    message_id: int
+    user_id: str
+    contents: str
+    is_from_me: bool
+    created_at: str
+
+    def __getitem__(self, key: Union[int, slice, str]) -> Any:
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
 
 class MessagesDatabase:
     """Manager for the new messages.db database with users table"""
@@ -16,6 +57,49 @@ class MessagesDatabase:
     def __init__(self, db_path: str = "./data/messages.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
+        # One connection per thread, opened on first use and reused, so
+        # sqlite3's per-connection statement cache keeps the repeated
+        # INSERT/SELECT statements prepared
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection to the messages database, opening it if needed
+
+        Callers use it as ``with self._connect() as conn:``, which commits or
+        rolls back the transaction but leaves the connection open.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        db_path = str(self.db_path)
+        # "file:" paths are SQLite URIs, e.g. shared-cache in-memory databases
+        conn = sqlite3.connect(db_path, uri=db_path.startswith("file:"))
+        # WAL is stored in the database file; it lets the polling service
+        # read while a migration writes
+        conn.execute("PRAGMA journal_mode = WAL")
+        # synchronous is per connection; in WAL mode NORMAL skips the fsync on
+        # each commit and still can't corrupt the database
+        conn.execute("PRAGMA synchronous = NORMAL")
+        # mmap_size is per connection and skips read() calls for cached pages
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's connection; the next call opens a new one"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __enter__(self) -> "MessagesDatabase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # Long-lived callers must close too: an open connection keeps reading
+        # the old file after the database is deleted and recreated
+        self.close()
 
     def create_database(self) -> bool:
         """
@@ -25,11 +109,12 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
-                
-                # Enable foreign key constraints
-                cursor.execute("PRAGMA foreign_keys = ON")
+
+                # foreign_keys is left off: the connection is shared with every
+                # later call, and users.user_id is not a key chat_users can
+                # reference, so enforcement would reject every chat_users insert
 
                 # Create users table with handle_id column
                 cursor.execute(
@@ -177,6 +262,11 @@ class MessagesDatabase:
                 cursor.execute(
                     "CREATE INDEX IF NOT EXISTS idx_chat_messages_message_date ON chat_messages(message_date)"
                 )
+                # Covers the chat history lookup: rows come back in message_date
+                # order for one chat, with message_id for the join, and no sort
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_chat_messages_chat_date ON chat_messages(chat_id, message_date, message_id)"
+                )
                 cursor.execute(
                     "CREATE INDEX IF NOT EXISTS idx_polling_state_last_sync ON polling_state(last_sync_timestamp)"
                 )
@@ -247,7 +337,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -286,7 +376,7 @@ class MessagesDatabase:
             return 0
 
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Prepare data for batch insert
@@ -331,7 +421,7 @@ class MessagesDatabase:
             User object if found, None otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -363,7 +453,7 @@ class MessagesDatabase:
             List of User objects
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -391,7 +481,7 @@ class MessagesDatabase:
             List of User objects
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -419,7 +509,7 @@ class MessagesDatabase:
             User object if found, None otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -452,7 +542,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -486,7 +576,7 @@ class MessagesDatabase:
             List of User objects
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 query = "SELECT user_id, first_name, last_name, phone_number, email, handle_id FROM users"
@@ -508,7 +598,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM users")
                 conn.commit()
@@ -528,7 +618,7 @@ class MessagesDatabase:
             Dictionary with database statistics
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Get total user count
@@ -581,7 +671,7 @@ class MessagesDatabase:
             True if table exists, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -607,7 +697,7 @@ class MessagesDatabase:
             List of column information tuples or None if error
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(f"PRAGMA table_info({table_name})")
                 return cursor.fetchall()
@@ -631,7 +721,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Insert chat
@@ -645,13 +735,8 @@ class MessagesDatabase:
 
                 # Add users to the chat if provided
                 if user_ids:
-                    chat_user_data = [(chat_id, user_id) for user_id in user_ids]
-                    cursor.executemany(
-                        """
-                        INSERT INTO chat_users (chat_id, user_id)
-                        VALUES (?, ?)
-                    """,
-                        chat_user_data,
+                    self._insert_chat_users(
+                        cursor, [(chat_id, user_id) for user_id in user_ids]
                     )
 
                 conn.commit()
@@ -675,7 +760,7 @@ class MessagesDatabase:
             return 0
 
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Prepare chat data for batch insert
@@ -690,22 +775,14 @@ class MessagesDatabase:
                 )
 
                 # Prepare chat_users data for batch insert
-                chat_user_data = []
-                for chat in chats:
-                    chat_id = chat["chat_id"]
-                    user_ids = chat.get("user_ids", [])
-                    if user_ids:
-                        for user_id in user_ids:
-                            chat_user_data.append((chat_id, user_id))
+                chat_user_data = [
+                    (chat["chat_id"], user_id)
+                    for chat in chats
+                    for user_id in chat.get("user_ids") or ()
+                ]
 
                 if chat_user_data:
-                    cursor.executemany(
-                        """
-                        INSERT INTO chat_users (chat_id, user_id)
-                        VALUES (?, ?)
-                    """,
-                        chat_user_data,
-                    )
+                    self._insert_chat_users(cursor, chat_user_data)
 
                 inserted_count = len(chat_data)
                 conn.commit()
@@ -719,6 +796,57 @@ class MessagesDatabase:
             logger.error(f"Error inserting chats batch: {e}")
             return 0
 
+    def _insert_chat_users(
+        self, cursor: sqlite3.Cursor, chat_user_data: List[tuple]
+    ) -> None:
+        """
+        Insert (chat_id, user_id) rows with multi-row INSERT ... VALUES statements
+
+        Args:
+            cursor: Cursor on an open messages database connection
+            chat_user_data: (chat_id, user_id) pairs to insert
+        """
+        # Two bound parameters per row, staying under SQLite's default limit
+        rows_per_statement = SQLITE_MAX_PARAMS // 2
+        for start in range(0, len(chat_user_data), rows_per_statement):
+            batch = chat_user_data[start : start + rows_per_statement]
+            values = ", ".join(["(?, ?)"] * len(batch))
+            cursor.execute(
+                f"INSERT INTO chat_users (chat_id, user_id) VALUES {values}",
+                [value for row in batch for value in row],
+            )
+
+    def _get_user_ids_for_chats(
+        self, cursor: sqlite3.Cursor, chat_ids: List[int]
+    ) -> Dict[int, List[str]]:
+        """
+        Get the user IDs of several chats with IN (...) lookups
+
+        Args:
+            cursor: Cursor on an open messages database connection
+            chat_ids: Chat IDs to get users for
+
+        Returns:
+            Dictionary mapping chat_id to its sorted user IDs; chats without
+            users are absent
+        """
+        user_ids_by_chat: Dict[int, List[str]] = {}
+        # Stay under SQLite's default limit on bound parameters per statement
+        for start in range(0, len(chat_ids), SQLITE_MAX_PARAMS):
+            batch = chat_ids[start : start + SQLITE_MAX_PARAMS]
+            placeholders = ", ".join("?" * len(batch))
+            cursor.execute(
+                f"""
+                SELECT chat_id, user_id
+                FROM chat_users WHERE chat_id IN ({placeholders})
+                ORDER BY chat_id, user_id
+            """,
+                batch,
+            )
+            for chat_id, user_id in cursor.fetchall():
+                user_ids_by_chat.setdefault(chat_id, []).append(user_id)
+        return user_ids_by_chat
+
     def get_chat_by_id(self, chat_id: int) -> Optional[Dict[str, Any]]:
         """
         Get a chat by its ID with associated users
@@ -730,7 +858,7 @@ class MessagesDatabase:
             Chat dictionary with user_ids list if found, None otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Get chat details
@@ -770,6 +898,50 @@ class MessagesDatabase:
             logger.error(f"Error getting chat {chat_id}: {e}")
             return None
 
+    def get_chats_by_ids(self, chat_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several chats by ID with associated users
+
+        Args:
+            chat_ids: Integer chat IDs to search for
+
+        Returns:
+            Dictionary mapping chat_id to its chat dictionary with user_ids;
+            IDs that don't exist are absent
+        """
+        chat_ids = list(chat_ids)
+        if not chat_ids:
+            return {}
+
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+
+                chats: Dict[int, Dict[str, Any]] = {}
+                # Stay under SQLite's default limit on bound parameters per statement
+                for start in range(0, len(chat_ids), SQLITE_MAX_PARAMS):
+                    batch = chat_ids[start : start + SQLITE_MAX_PARAMS]
+                    placeholders = ", ".join("?" * len(batch))
+                    cursor.execute(
+                        f"""
+                        SELECT chat_id, display_name
+                        FROM chats WHERE chat_id IN ({placeholders})
+                    """,
+                        batch,
+                    )
+                    for chat_id, display_name in cursor.fetchall():
+                        chats[chat_id] = {"chat_id": chat_id, "display_name": display_name}
+
+                user_ids_by_chat = self._get_user_ids_for_chats(cursor, list(chats))
+                for chat_id, chat in chats.items():
+                    chat["user_ids"] = user_ids_by_chat.get(chat_id, [])
+
+                return chats
+
+        except sqlite3.Error as e:
+            logger.error(f"Error getting chats by ID: {e}")
+            return {}
+
     def get_chats_by_display_name(self, display_name: str) -> List[Dict[str, Any]]:
         """
         Get chats by display name with associated users
@@ -781,45 +953,28 @@ class MessagesDatabase:
             List of chat dictionaries with user_ids, ordered by message count (highest first)
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Get chats with the display name, ordered by message count (highest first)
-                cursor.execute(
-                    """
-                    SELECT c.chat_id, c.display_name, COALESCE(COUNT(cm.message_id), 0) as message_count
-                    FROM chats c
-                    LEFT JOIN chat_messages cm ON c.chat_id = cm.chat_id
-                    WHERE c.display_name = ?
-                    GROUP BY c.chat_id, c.display_name
-                    ORDER BY message_count DESC, c.chat_id
-                """,
-                    (display_name,),
-                )
+                cursor.execute(CHATS_BY_DISPLAY_NAME_SQL, (display_name,))
 
                 chat_rows = cursor.fetchall()
                 if not chat_rows:
                     return []
 
+                # Get users for all of these chats in one query
+                user_ids_by_chat = self._get_user_ids_for_chats(
+                    cursor, [row[0] for row in chat_rows]
+                )
+
                 chats = []
                 for chat_id, display_name, message_count in chat_rows:
-                    # Get users for this chat
-                    cursor.execute(
-                        """
-                        SELECT user_id
-                        FROM chat_users WHERE chat_id = ?
-                        ORDER BY user_id
-                    """,
-                        (chat_id,),
-                    )
-
-                    user_ids = [row[0] for row in cursor.fetchall()]
-
                     chats.append(
                         {
                             "chat_id": chat_id,
                             "display_name": display_name,
-                            "user_ids": user_ids,
+                            "user_ids": user_ids_by_chat.get(chat_id, []),
                             "message_count": message_count,
                         }
                     )
@@ -841,7 +996,7 @@ class MessagesDatabase:
             List of chat dictionaries with user_ids
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Get all chats
@@ -852,25 +1007,18 @@ class MessagesDatabase:
                 cursor.execute(query)
                 chat_rows = cursor.fetchall()
 
+                # Get users for all of these chats in one query
+                user_ids_by_chat = self._get_user_ids_for_chats(
+                    cursor, [row[0] for row in chat_rows]
+                )
+
                 chats = []
                 for chat_id, display_name in chat_rows:
-                    # Get users for this chat
-                    cursor.execute(
-                        """
-                        SELECT user_id
-                        FROM chat_users WHERE chat_id = ?
-                        ORDER BY user_id
-                    """,
-                        (chat_id,),
-                    )
-
-                    user_ids = [row[0] for row in cursor.fetchall()]
-
                     chats.append(
                         {
                             "chat_id": chat_id,
                             "display_name": display_name,
-                            "user_ids": user_ids,
+                            "user_ids": user_ids_by_chat.get(chat_id, []),
                         }
                     )
 
@@ -888,7 +1036,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Clear chat_users first due to foreign key constraint
@@ -916,7 +1064,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -946,7 +1094,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -975,7 +1123,7 @@ class MessagesDatabase:
             List of chat dictionaries
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -989,25 +1137,20 @@ class MessagesDatabase:
                     (user_id,),
                 )
 
-                chats = []
-                for chat_id, display_name in cursor.fetchall():
-                    # Get all users for this chat
-                    cursor.execute(
-                        """
-                        SELECT user_id
-                        FROM chat_users WHERE chat_id = ?
-                        ORDER BY user_id
-                    """,
-                        (chat_id,),
-                    )
+                chat_rows = cursor.fetchall()
 
-                    user_ids = [row[0] for row in cursor.fetchall()]
+                # Get all users for these chats in one query
+                user_ids_by_chat = self._get_user_ids_for_chats(
+                    cursor, [row[0] for row in chat_rows]
+                )
 
+                chats = []
+                for chat_id, display_name in chat_rows:
                     chats.append(
                         {
                             "chat_id": chat_id,
                             "display_name": display_name,
-                            "user_ids": user_ids,
+                            "user_ids": user_ids_by_chat.get(chat_id, []),
                         }
                     )
 
@@ -1028,7 +1171,7 @@ class MessagesDatabase:
             List of user detail dictionaries
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -1084,7 +1227,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -1102,12 +1245,14 @@ class MessagesDatabase:
             logger.error(f"Error inserting message {message_id}: {e}")
             return False
 
-    def insert_messages_batch(self, messages: List[Dict[str, Any]]) -> int:
+    def insert_messages_batch(
+        self, messages: List[Union[MessageRow, Dict[str, Any]]]
+    ) -> int:
         """
         Insert multiple messages in a batch operation
 
         Args:
-            messages: List of message dictionaries with keys:
+            messages: List of MessageRow tuples or message dictionaries with keys:
                      message_id (int), user_id, contents, is_from_me, created_at
 
         Returns:
@@ -1117,12 +1262,15 @@ class MessagesDatabase:
             return 0
 
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Prepare data for batch insert
+                # MessageRow is already a tuple in column order
                 message_data = [
-                    (
+                    msg
+                    if isinstance(msg, MessageRow)
+                    else (
                         msg["message_id"],
                         msg["user_id"],
                         msg["contents"],
@@ -1163,7 +1311,7 @@ class MessagesDatabase:
             Message dictionary if found, None otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -1205,7 +1353,7 @@ class MessagesDatabase:
             List of message dictionaries
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 query = """
@@ -1248,7 +1396,7 @@ class MessagesDatabase:
             List of message dictionaries
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 query = """
@@ -1280,6 +1428,42 @@ class MessagesDatabase:
             logger.error(f"Error getting all messages: {e}")
             return []
 
+    def has_messages(self) -> bool:
+        """
+        Check whether the messages table has any rows
+
+        Uses EXISTS so SQLite stops at the first row instead of counting.
+
+        Returns:
+            True if at least one message exists, False otherwise
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT EXISTS(SELECT 1 FROM messages)")
+                return bool(cursor.fetchone()[0])
+
+        except sqlite3.Error as e:
+            logger.error(f"Error checking for messages: {e}")
+            return False
+
+    def count_messages(self) -> int:
+        """
+        Count the rows in the messages table
+
+        Returns:
+            Number of messages, or 0 on error
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT COUNT(*) FROM messages")
+                return cursor.fetchone()[0]
+
+        except sqlite3.Error as e:
+            logger.error(f"Error counting messages: {e}")
+            return 0
+
     def clear_messages_table(self) -> bool:
         """
         Clear all messages from the messages table
@@ -1288,7 +1472,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM messages")
                 conn.commit()
@@ -1315,7 +1499,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -1348,7 +1532,7 @@ class MessagesDatabase:
             return 0
 
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Prepare data for batch insert
@@ -1381,6 +1565,74 @@ class MessagesDatabase:
             logger.error(f"Error inserting chat_messages batch: {e}")
             return 0
 
+    def bulk_load(
+        self,
+        users: Sequence[tuple] = (),
+        chats: Sequence[tuple] = (),
+        chat_users: Sequence[tuple] = (),
+        messages: Sequence[tuple] = (),
+        chat_messages: Sequence[tuple] = (),
+    ) -> bool:
+        """
+        Load rows into several tables in a single transaction
+
+        Each argument is a sequence of plain tuples in table column order:
+        users (user_id, first_name, last_name, phone_number, email, handle_id),
+        chats (chat_id, display_name), chat_users (chat_id, user_id),
+        messages (message_id, user_id, contents, is_from_me, created_at) and
+        chat_messages (chat_id, message_id, message_date). Tables are loaded
+        parents first, so a failure rolls back every table.
+
+        Args:
+            users: Rows for the users table
+            chats: Rows for the chats table
+            chat_users: Rows for the chat_users table
+            messages: Rows for the messages table (MessageRow works as is)
+            chat_messages: Rows for the chat_messages table
+
+        Returns:
+            True if every row was loaded, False otherwise
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+
+                cursor.executemany(
+                    """
+                    INSERT INTO users (user_id, first_name, last_name, phone_number, email, handle_id)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    users,
+                )
+                cursor.executemany(
+                    "INSERT INTO chats (chat_id, display_name) VALUES (?, ?)", chats
+                )
+                cursor.executemany(
+                    "INSERT INTO chat_users (chat_id, user_id) VALUES (?, ?)",
+                    chat_users,
+                )
+                cursor.executemany(
+                    """
+                    INSERT INTO messages (message_id, user_id, contents, is_from_me, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    messages,
+                )
+                cursor.executemany(
+                    """
+                    INSERT INTO chat_messages (chat_id, message_id, message_date)
+                    VALUES (?, ?, ?)
+                """,
+                    chat_messages,
+                )
+
+                conn.commit()
+                return True
+
+        except sqlite3.Error as e:
+            logger.error(f"Error bulk loading messages database: {e}")
+            return False
+
     def get_messages_in_chat(
         self, chat_id: int, limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
@@ -1395,7 +1647,7 @@ class MessagesDatabase:
             List of message dictionaries with chat context
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 query = """
@@ -1450,7 +1702,7 @@ class MessagesDatabase:
             List of chat dictionaries
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -1489,7 +1741,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM chat_messages")
                 conn.commit()
@@ -1509,7 +1761,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Create polling_state table
@@ -1548,7 +1800,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Check if polling state already exists
@@ -1588,7 +1840,7 @@ class MessagesDatabase:
             Dictionary with polling state or None if error
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -1642,7 +1894,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 from datetime import datetime
@@ -1693,7 +1945,7 @@ class MessagesDatabase:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 from datetime import datetime
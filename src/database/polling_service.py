@@ -407,8 +407,14 @@ class MessagePollingService:
         finally:
             self.is_running = False
             self.messages_db.set_sync_status("stopped")
+            self.close()
             logger.info("Polling service stopped")
 
+    def close(self) -> None:
+        """Close the database connections opened by the polling loop"""
+        self.messages_db.close()
+        self.handle_matcher.close()
+
     def stop_polling(self) -> None:
         """
         Stop the polling loop
@@ -2,14 +2,69 @@
 
 import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from src.user.user import User
 from src.utils.logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# Upper bound on concurrent AddressBook database scans
+MAX_EXTRACTION_WORKERS = 4
+
+# Rows fetched per round trip when streaming extraction results
+EXTRACTION_BATCH_SIZE = 1000
+
+# One row per contact; the primary phone and email are picked in SQL so the
+# other numbers/addresses never leave SQLite. Shared by every database scan.
+_EXTRACT_SQL = """
+    SELECT
+        r.ZFIRSTNAME,
+        r.ZLASTNAME,
+        (
+            SELECT p.ZFULLNUMBER
+            FROM ZABCDPHONENUMBER p
+            WHERE p.ZOWNER = r.Z_PK AND p.ZFULLNUMBER <> ''
+            ORDER BY p.ZISPRIMARY DESC, p.Z_PK
+            LIMIT 1
+        ) AS phone,
+        (
+            SELECT e.ZADDRESS
+            FROM ZABCDEMAILADDRESS e
+            WHERE e.ZOWNER = r.Z_PK AND e.ZADDRESS <> ''
+            ORDER BY e.ZISPRIMARY DESC, e.Z_PK
+            LIMIT 1
+        ) AS email
+    FROM ZABCDRECORD r
+    WHERE r.ZFIRSTNAME IS NOT NULL OR r.ZLASTNAME IS NOT NULL
+"""
+
+
+def _format_us_phone(digits: str) -> str:
+    """Format 10 digits as (XXX) XXX-XXXX"""
+    return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+
+
+def _format_us_phone_with_country_code(digits: str) -> Optional[str]:
+    """Format 11 digits with a leading US country code, else None"""
+    if digits[0] != "1":
+        return None
+    return _format_us_phone(digits[1:])
+
+
+def _normalize_email(email: str) -> str:
+    """Lowercase an email, reusing the string when it is already lowercase"""
+    return email if email.islower() else email.lower()
+
+
+# Phone formatters keyed by digit count
+_PHONE_FORMATTERS = {
+    10: _format_us_phone,
+    11: _format_us_phone_with_country_code,
+}
+
 
 class AddressBookExtractor:
     """Extracts user data from macOS address book databases"""
@@ -26,15 +81,20 @@ class AddressBookExtractor:
         # Remove all non-digits
         normalized = "".join(filter(str.isdigit, phone))
 
-        # If it starts with 1, remove it (US country code)
-        if normalized.startswith("1") and len(normalized) == 11:
-            normalized = normalized[1:]
+        formatter = _PHONE_FORMATTERS.get(len(normalized))
+        formatted = formatter(normalized) if formatter else None
 
-        # Format as (XXX) XXX-XXXX if 10 digits
-        if len(normalized) == 10:
-            return f"({normalized[:3]}) {normalized[3:6]}-{normalized[6:]}"
+        return formatted or phone  # Return original if can't normalize
 
-        return phone  # Return original if can't normalize
+    def _connect(self, db_path: Path) -> sqlite3.Connection:
+        """Open an AddressBook database for read-only extraction"""
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        # Tell SQLite up front that this connection only reads, and let it
+        # memory-map the file instead of copying pages into its own cache
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
 
     def _get_addressbook_databases(self) -> List[Path]:
         """Get all AddressBook database paths"""
@@ -55,10 +115,71 @@ class AddressBookExtractor:
 
         return databases
 
+    def _extract_from_db(self, db_path: Path) -> List[User]:
+        """
+        Extract users from a single AddressBook database
+
+        Runs on a worker thread, so the connection is opened here rather than
+        shared. Duplicates are not removed; see extract_users.
+
+        Args:
+            db_path: Path to the AddressBook database
+
+        Returns:
+            List of User objects created from the database's contacts
+        """
+        users = []
+
+        try:
+            with self._connect(db_path) as conn:
+                cursor = conn.execute(_EXTRACT_SQL)
+
+                # Stream rows instead of materialising every contact at once
+                cursor.arraysize = EXTRACTION_BATCH_SIZE
+
+                record_count = 0
+                for first_name, last_name, phone, email in cursor:
+                    record_count += 1
+                    first_name = first_name or ""
+                    last_name = last_name or ""
+
+                    # Skip if no name
+                    if not first_name and not last_name:
+                        continue
+
+                    primary_phone = self._normalize_phone(phone)
+                    primary_email = _normalize_email(email) if email else ""
+
+                    # Skip if no contact methods
+                    if not primary_phone and not primary_email:
+                        continue
+
+                    try:
+                        user = User.from_address_book_record(
+                            first_name=first_name,
+                            last_name=last_name,
+                            phone_number=primary_phone,
+                            email=primary_email,
+                        )
+                        users.append(user)
+                    except ValueError as e:
+                        logger.warning(f"Skipping invalid user record: {e}")
+                        continue
+
+                logger.info(f"Found {record_count} contact records in {db_path.name}")
+
+        except sqlite3.Error as e:
+            logger.error(f"Error processing database {db_path}: {e}")
+
+        return users
+
     def extract_users(self) -> List[User]:
         """
         Extract users from all AddressBook databases
 
+        Databases are scanned concurrently; results are merged and
+        de-duplicated in database order.
+
         Returns:
             List of User objects created from address book data
         """
@@ -67,102 +188,28 @@ class AddressBookExtractor:
 
         logger.info(f"Found {len(databases)} AddressBook databases to process")
 
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(MAX_EXTRACTION_WORKERS, len(databases)))
+        ) as executor:
+            results = list(executor.map(self._extract_from_db, databases))
+
         # Track users by phone/email to avoid duplicates
         seen_contacts = set()
 
-        for db_path in databases:
-            try:
-                with sqlite3.connect(str(db_path)) as conn:
-                    cursor = conn.cursor()
-
-                    # Get all contacts with their phone numbers and emails
-                    cursor.execute(
-                        """
-                        SELECT DISTINCT 
-                            r.Z_PK,
-                            r.ZFIRSTNAME,
-                            r.ZLASTNAME,
-                            p.ZFULLNUMBER,
-                            e.ZADDRESS
-                        FROM ZABCDRECORD r
-                        LEFT JOIN ZABCDPHONENUMBER p ON r.Z_PK = p.ZOWNER
-                        LEFT JOIN ZABCDEMAILADDRESS e ON r.Z_PK = e.ZOWNER
-                        WHERE r.ZFIRSTNAME IS NOT NULL OR r.ZLASTNAME IS NOT NULL
-                    """
-                    )
-
-                    records = cursor.fetchall()
-                    logger.info(
-                        f"Found {len(records)} contact records in {db_path.name}"
-                    )
-
-                    # Group records by person (Z_PK)
-                    contacts_by_person = {}
-                    for record in records:
-                        z_pk, first_name, last_name, phone, email = record
-
-                        if z_pk not in contacts_by_person:
-                            contacts_by_person[z_pk] = {
-                                "first_name": first_name or "",
-                                "last_name": last_name or "",
-                                "phones": set(),
-                                "emails": set(),
-                            }
-
-                        if phone:
-                            contacts_by_person[z_pk]["phones"].add(phone)
-                        if email:
-                            contacts_by_person[z_pk]["emails"].add(email.lower())
-
-                    # Create User objects for each unique person
-                    for z_pk, contact_data in contacts_by_person.items():
-                        first_name = contact_data["first_name"]
-                        last_name = contact_data["last_name"]
-
-                        # Skip if no name
-                        if not first_name and not last_name:
-                            continue
-
-                        # Get primary phone and email
-                        primary_phone = ""
-                        primary_email = ""
-
-                        if contact_data["phones"]:
-                            primary_phone = self._normalize_phone(
-                                list(contact_data["phones"])[0]
-                            )
-
-                        if contact_data["emails"]:
-                            primary_email = list(contact_data["emails"])[0]
-
-                        # Skip if no contact methods
-                        if not primary_phone and not primary_email:
-                            continue
-
-                        # Create unique identifier to avoid duplicates
-                        contact_key = (
-                            f"{first_name}:{last_name}:{primary_phone}:{primary_email}"
-                        )
-                        if contact_key in seen_contacts:
-                            continue
-
-                        seen_contacts.add(contact_key)
-
-                        try:
-                            user = User.from_address_book_record(
-                                first_name=first_name,
-                                last_name=last_name,
-                                phone_number=primary_phone,
-                                email=primary_email,
-                            )
-                            users.append(user)
-                        except ValueError as e:
-                            logger.warning(f"Skipping invalid user record: {e}")
-                            continue
-
-            except sqlite3.Error as e:
-                logger.error(f"Error processing database {db_path}: {e}")
-                continue
+        for db_users in results:
+            for user in db_users:
+                # Create unique identifier to avoid duplicates
+                contact_key = (
+                    user.first_name,
+                    user.last_name,
+                    user.phone_number,
+                    user.email,
+                )
+                if contact_key in seen_contacts:
+                    continue
+
+                seen_contacts.add(contact_key)
+                users.append(user)
 
         logger.info(f"Extracted {len(users)} unique users from address book")
         return users
@@ -184,7 +231,7 @@ class AddressBookExtractor:
 
         for db_path in databases:
             try:
-                with sqlite3.connect(str(db_path)) as conn:
+                with self._connect(db_path) as conn:
                     cursor = conn.cursor()
 
                     # Count total records
@@ -229,10 +276,8 @@ class AddressBookExtractor:
                     """
                     )
 
-                    for record in cursor.fetchall():
-                        first_name, last_name, phone, email = record
-                        contact_key = f"{first_name}:{last_name}:{phone}:{email}"
-                        seen_contacts.add(contact_key)
+                    # Rows are already (first, last, phone, email) tuples
+                    seen_contacts.update(cursor)
 
             except sqlite3.Error as e:
                 logger.error(f"Error getting stats from {db_path}: {e}")
@@ -8,7 +8,7 @@ import logging
 from typing import Optional
 
 from .types import MessageRequest, MessageResponse, NewMessage, LLMPromptData
-from .chat_history import get_chat_history_for_message_generation
+from .chat_history import close_ro_connections, get_chat_history_for_message_generation
 from .llm_client import LLMClient
 from src.utils.logger_config import get_logger
 
@@ -28,6 +28,14 @@ class MessageMakerService:
         self.llm_client = LLMClient()
         self.logger = get_logger(__name__)
 
+    def close(self) -> None:
+        """Close the cached read-only connection to the messages database.
+        
+        Call this when the service shuts down, or after the database at
+        db_path is rebuilt so later calls read the new file.
+        """
+        close_ro_connections(self.db_path)
+
     def generate_message_responses(self, request: MessageRequest, max_context_messages: int = 2000) -> MessageResponse:
         """Generate three response variations for a new message.
         
@@ -55,7 +63,8 @@ class MessageMakerService:
         try:
             chat_history = get_chat_history_for_message_generation(
                 chat_id=str(request.chat_id),
-                user_id=request.user_id
+                user_id=request.user_id,
+                db_path=self.db_path
             )
             
             # Limit to most recent messages to avoid token limits
@@ -111,4 +120,7 @@ def generate_message_responses(request: MessageRequest, max_context_messages: in
         Exception: If database connection or LLM API errors occur
     """
     service = MessageMakerService()
-    return service.generate_message_responses(request, max_context_messages)
\ No newline at end of file
+    try:
+        return service.generate_message_responses(request, max_context_messages)
+    finally:
+        service.close()
\ No newline at end of file
@@ -6,7 +6,8 @@ messages tables for LLM consumption.
 """
 
 import sqlite3
-from typing import List
+import threading
+from typing import Dict, List, Optional, Union
 from pathlib import Path
 
 from src.database.messages_db import MessagesDatabase
@@ -15,8 +16,103 @@ from src.utils.logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# Query to join chat_messages and messages tables
+# Order by message_date for chronological context (oldest first)
+# Note: In this data model, "me" is implicit - is_from_me field indicates if message is from the requesting user
+# Kept as one constant so a reused connection's statement cache can find the
+# prepared statement again instead of re-parsing it
+CHAT_HISTORY_SQL = """
+    SELECT m.contents, m.is_from_me, m.created_at
+    FROM messages m
+    JOIN chat_messages cm ON m.message_id = cm.message_id
+    WHERE cm.chat_id = ?
+    ORDER BY cm.message_date ASC
+"""
+
+
+# Read-only connections shared by lookups on the same database path
+_ro_connections: Dict[str, sqlite3.Connection] = {}
+_ro_connections_lock = threading.Lock()
+
+
+def _get_ro_connection(db_path: str) -> sqlite3.Connection:
+    """Open a read-only connection to db_path, shared by later lookups on the same path.
 
-def get_chat_history_for_message_generation(chat_id: str, user_id: str = None) -> List[ChatMessage]:
+    Reusing the connection lets sqlite3's per-connection statement cache keep
+    CHAT_HISTORY_SQL prepared between calls. It stays open until
+    close_ro_connections() is called for the path.
+
+    Raises:
+        sqlite3.OperationalError: If a plain db_path does not exist; it is
+            never created
+    """
+    with _ro_connections_lock:
+        conn = _ro_connections.get(db_path)
+        if conn is None:
+            # "file:" paths are SQLite URIs and used as given, e.g. shared-cache
+            # in-memory databases, which can't be opened with mode=ro
+            uri = db_path if db_path.startswith("file:") else f"{Path(db_path).absolute().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, check_same_thread=False, uri=True)
+            # Also keeps connections to such URIs from writing
+            conn.execute("PRAGMA query_only = 1")
+            _ro_connections[db_path] = conn
+        return conn
+
+
+def close_ro_connections(db_path: Optional[Union[str, Path]] = None) -> None:
+    """Close the cached read-only connection for db_path, or all of them.
+
+    Call this when a database file is replaced, so later lookups open the new
+    file instead of reading the old one, or to release in-memory databases.
+
+    Args:
+        db_path: Database whose connection to close; all when omitted
+    """
+    with _ro_connections_lock:
+        if db_path is None:
+            conns = list(_ro_connections.values())
+            _ro_connections.clear()
+        else:
+            conn = _ro_connections.pop(str(db_path), None)
+            conns = [conn] if conn is not None else []
+    for conn in conns:
+        conn.close()
+
+
+def _query_chat_history(conn: sqlite3.Connection, chat_id_int: int) -> List[ChatMessage]:
+    """Run the chat history query on an open connection."""
+    cursor = conn.cursor()
+
+    # Convert database results to ChatMessage objects as they are stepped,
+    # without materializing the raw rows first
+    chat_messages = []
+    for contents, is_from_me, created_at in cursor.execute(CHAT_HISTORY_SQL, (chat_id_int,)):
+        # Create ChatMessage for LLM consumption
+        # Use the is_from_me field directly from the database since "me" is implicit
+        chat_message = ChatMessage(
+            contents=contents,
+            is_from_me=bool(is_from_me),
+            created_at=created_at
+        )
+
+        # Validate the chat message
+        chat_message.validate()
+        chat_messages.append(chat_message)
+
+    if not chat_messages:
+        logger.info(f"No messages found for chat_id={chat_id_int}")
+        return []
+
+    logger.info(f"Retrieved {len(chat_messages)} messages for chat_id={chat_id_int}")
+    return chat_messages
+
+
+def get_chat_history_for_message_generation(
+    chat_id: str,
+    user_id: str = None,
+    db_path: Optional[Union[str, Path]] = None,
+    conn: Optional[sqlite3.Connection] = None,
+) -> List[ChatMessage]:
     """
     Retrieve all messages in a chat, formatted for LLM consumption.
     
@@ -29,13 +125,18 @@ def get_chat_history_for_message_generation(chat_id: str, user_id: str = None) -
     Args:
         chat_id: Chat ID to retrieve messages for
         user_id: User ID making the request (optional, not used for is_from_me determination)
+        db_path: Path or "file:" URI of the messages database; defaults to
+                 ./data/messages.db. Ignored when conn is given.
+        conn: Optional open connection to the messages database; it is reused
+              and left open. When omitted, a cached read-only connection to
+              db_path is used.
         
     Returns:
         List of ChatMessage objects ordered chronologically (oldest first)
         
     Raises:
         ValueError: If chat_id cannot be converted to integer
-        sqlite3.Error: If database query fails
+        sqlite3.Error: If db_path does not exist or the database query fails
     """
     # Convert chat_id to integer for database query
     try:
@@ -46,50 +147,13 @@ def get_chat_history_for_message_generation(chat_id: str, user_id: str = None) -
 
     logger.info(f"Retrieving chat history for chat_id={chat_id_int}")
 
-    # Use default database path
-    db_path = Path("./data/messages.db")
-    
     try:
-        with sqlite3.connect(str(db_path)) as conn:
-            cursor = conn.cursor()
-
-            # Query to join chat_messages and messages tables
-            # Order by message_date for chronological context (oldest first)
-            # Note: In this data model, "me" is implicit - is_from_me field indicates if message is from the requesting user
-            query = """
-                SELECT m.contents, m.is_from_me, m.created_at
-                FROM messages m
-                JOIN chat_messages cm ON m.message_id = cm.message_id
-                WHERE cm.chat_id = ?
-                ORDER BY cm.message_date ASC
-            """
-
-            cursor.execute(query, (chat_id_int,))
-            rows = cursor.fetchall()
-
-            if not rows:
-                logger.info(f"No messages found for chat_id={chat_id_int}")
-                return []
-
-            # Convert database results to ChatMessage objects
-            chat_messages = []
-            for row in rows:
-                contents, is_from_me, created_at = row
-
-                # Create ChatMessage for LLM consumption
-                # Use the is_from_me field directly from the database since "me" is implicit
-                chat_message = ChatMessage(
-                    contents=contents,
-                    is_from_me=bool(is_from_me),
-                    created_at=created_at
-                )
-
-                # Validate the chat message
-                chat_message.validate()
-                chat_messages.append(chat_message)
-
-            logger.info(f"Retrieved {len(chat_messages)} messages for chat_id={chat_id_int}")
-            return chat_messages
+        if conn is not None:
+            return _query_chat_history(conn, chat_id_int)
+
+        # Use default database path unless one is given
+        db_path = str(db_path if db_path is not None else Path("./data/messages.db"))
+        return _query_chat_history(_get_ro_connection(db_path), chat_id_int)
 
     except sqlite3.Error as e:
         logger.error(f"Database error retrieving chat history for chat_id={chat_id_int}: {e}")
@@ -97,4 +161,4 @@ def get_chat_history_for_message_generation(chat_id: str, user_id: str = None) -
 
     except Exception as e:
         logger.error(f"Unexpected error retrieving chat history for chat_id={chat_id_int}: {e}")
-        raise
\ No newline at end of file
+        raise
@@ -45,7 +45,7 @@ class MessageRequest:
             raise ValueError("contents must be a non-empty string")
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageResponse:
     """Response model containing generated message suggestions."""
     response_1: str
@@ -82,7 +82,7 @@ class MessageResponse:
         return [self.response_1, self.response_2, self.response_3]
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatMessage:
     """Represents a message in chat history."""
     contents: str
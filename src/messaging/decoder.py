@@ -3,7 +3,7 @@
 import logging
 import plistlib
 import struct
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -468,16 +468,42 @@ def extract_message_text(
     Returns:
         Best available text content
     """
-    # Primary: use text column if available
-    if text and text.strip():
-        return text.strip()
-
-    # Fallback: decode attributedBody
-    if attributed_body:
-        decoder = MessageDecoder()
-        decoded_text = decoder.decode_attributed_body(attributed_body)
+    return extract_message_text_batch([(text, attributed_body)])[0]
+
+
+def extract_message_text_batch(
+    rows: Iterable[Tuple[Optional[str], Optional[bytes]]],
+    decoder: Optional[MessageDecoder] = None,
+) -> List[Optional[str]]:
+    """
+    Extract message text for many rows with a single decoder.
+
+    Uses the text column when it has content and falls back to decoding
+    attributedBody. One MessageDecoder is shared across the batch instead of
+    being created for every message.
+
+    Args:
+        rows: (text, attributed_body) pairs
+        decoder: Optional decoder to use, e.g. to collect its statistics
+
+    Returns:
+        Best available text content for each row, in input order
+    """
+    decoder = decoder or MessageDecoder()
+
+    results = []
+    for text, attributed_body in rows:
+        # Primary: use text column if available
+        if text and text.strip():
+            results.append(text.strip())
+            continue
+
+        # Fallback: decode attributedBody
+        decoded_text = decoder.decode_attributed_body(attributed_body) if attributed_body else None
         if decoded_text and decoded_text.strip():
-            return decoded_text.strip()
+            results.append(decoded_text.strip())
+        else:
+            # No text available
+            results.append(None)
 
-    # No text available
-    return None
+    return results
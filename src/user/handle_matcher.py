@@ -25,6 +25,10 @@ class HandleMatcher:
         self.messages_db = MessagesDatabase(messages_db_path)
         self.addressbook_extractor = AddressBookExtractor()
 
+    def close(self) -> None:
+        """Close the messages database connection opened by this matcher"""
+        self.messages_db.close()
+
     def normalize_phone_number(self, phone: str) -> str:
         """
         Normalize a phone number for matching
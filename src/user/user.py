@@ -2,14 +2,14 @@
 
 import uuid
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Any, Dict, Optional
 
 from src.utils.logger_config import get_logger
 
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """User data class for managing user information"""
 
@@ -59,25 +59,29 @@ class User:
         """
         if user_id is None:
             user_id = str(uuid.uuid4())
+        elif not user_id:
+            raise ValueError("user_id is required")
 
         # Ensure we have at least one contact method
         if not phone_number and not email:
             raise ValueError("Must provide either phone_number or email")
 
+        if not first_name and not last_name and handle_id is None:
+            raise ValueError("At least one of first_name or last_name must be provided")
+
+        # All checks from __post_init__ have been applied above, so build the
+        # instance directly instead of validating a second time.
+        user = cls.__new__(cls)
+        user.user_id = user_id
+        user.first_name = first_name
+        user.last_name = last_name
         # Provide empty string if one is missing (to satisfy table constraints)
-        phone_number = phone_number or ""
-        email = email or ""
-
-        return cls(
-            user_id=user_id,
-            first_name=first_name,
-            last_name=last_name,
-            phone_number=phone_number,
-            email=email,
-            handle_id=handle_id,
-        )
-
-    def to_dict(self) -> Dict[str, str]:
+        user.phone_number = phone_number or ""
+        user.email = email or ""
+        user.handle_id = handle_id
+        return user
+
+    def to_dict(self) -> Dict[str, Any]:
         """Convert user to dictionary for database operations"""
         return {
             "user_id": self.user_id,
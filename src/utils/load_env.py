@@ -21,13 +21,18 @@ def load_env():
         # Fallback to manual parsing
         print(f"Loading environment variables from {env_file} (manual parsing)")
         with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    # Remove quotes if present
-                    value = value.strip().strip('"').strip("'")
-                    os.environ[key.strip()] = value
+            lines = (line.strip() for line in f)
+            pairs = (
+                line.split('=', 1)
+                for line in lines
+                if line and not line.startswith('#') and '=' in line
+            )
+            # Remove quotes if present
+            parsed = {
+                key.strip(): value.strip().strip('"').strip("'")
+                for key, value in pairs
+            }
+        os.environ.update(parsed)
         print("✅ Environment variables loaded")
 
 if __name__ == "__main__":
@@ -0,0 +1,20 @@
+"""Shared pytest configuration for the test suite"""
+
+import sys
+from pathlib import Path
+
+# Make the project root importable once, so tests can use explicit
+# ``src.`` / ``scripts.`` imports regardless of the working directory
+PROJECT_ROOT = str(Path(__file__).parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def pytest_configure(config):
+    """Register the markers used to select subsets of the suite"""
+    config.addinivalue_line(
+        "markers", "fast: pure in-memory tests, e.g. `pytest -m fast -n auto`"
+    )
+    config.addinivalue_line(
+        "markers", "integration: tests exercising several components together"
+    )
@@ -0,0 +1,90 @@
+"""Shared in-memory database fixtures for the test suite
+
+Classes build a messages database once as a shared-cache in-memory template,
+and each test works on its own copy, made with the sqlite3 backup API rather
+than by re-running the DDL and seed inserts.
+"""
+
+import sqlite3
+import unittest
+import uuid
+from typing import Tuple
+
+from src.database.messages_db import MessagesDatabase
+
+
+def memory_db_uri(name: str) -> str:
+    """Build a URI for a shared-cache in-memory database unique to this process
+
+    A shared-cache memory database lives as long as one connection to it is
+    open, and is freed once the last one closes.
+
+    Args:
+        name: Readable prefix for the database, e.g. the test id
+    """
+    return f"file:{name}_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+
+def copy_memory_db(template_conn: sqlite3.Connection, name: str) -> Tuple[str, sqlite3.Connection]:
+    """Copy a template into a new in-memory database
+
+    Args:
+        template_conn: Open connection to the template database
+        name: Readable prefix for the copy's URI
+
+    Returns:
+        The copy's URI and a connection that keeps it alive until closed
+    """
+    db_path = memory_db_uri(name)
+    db_conn = sqlite3.connect(db_path, uri=True)
+    template_conn.backup(db_conn)
+    return db_path, db_conn
+
+
+class MemoryTemplateTestCase(unittest.TestCase):
+    """Builds one in-memory messages database per class, at template_db_path
+
+    Subclasses seed it by overriding populate_template().
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the schema and seed data once in a shared-cache in-memory template"""
+        super().setUpClass()
+        cls.template_db_path = memory_db_uri(cls.__name__)
+        # The template lives as long as this connection stays open
+        cls.template_conn = sqlite3.connect(cls.template_db_path, uri=True)
+
+        template_db = MessagesDatabase(cls.template_db_path)
+        assert template_db.create_database()
+        template_db.close()
+        cls.populate_template(cls.template_db_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Release the template database"""
+        cls.template_conn.close()
+        super().tearDownClass()
+
+    @classmethod
+    def populate_template(cls, db_path: str) -> None:
+        """Seed the template after its schema is created; empty by default"""
+
+
+class MemoryDatabaseTestCase(MemoryTemplateTestCase):
+    """Gives each test its own in-memory copy of the class template
+
+    Tests use db_path, db_conn (which keeps the copy alive) and messages_db.
+    """
+
+    def setUp(self):
+        """Copy the template into this test's own in-memory database"""
+        super().setUp()
+        self.db_path, self.db_conn = copy_memory_db(self.template_conn, self.id())
+        self.messages_db = MessagesDatabase(self.db_path)
+
+    def tearDown(self):
+        """Close every connection, which frees the test's database"""
+        self.messages_db.close()
+        self.db_conn.close()
+        super().tearDown()
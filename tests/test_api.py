@@ -1,305 +1,304 @@
 """Comprehensive test suite for the main API function."""
 
 import pytest
-import unittest.mock as mock
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, create_autospec
 import sqlite3
-from datetime import datetime
+from types import SimpleNamespace
 
-from src.message_maker.api import MessageMakerService, generate_message_responses
-from src.message_maker.types import MessageRequest, MessageResponse, ChatMessage, NewMessage, LLMPromptData
+from src.message_maker.types import MessageRequest, MessageResponse, ChatMessage, LLMPromptData
 
 
-class TestMessageMakerService:
-    """Test cases for MessageMakerService class."""
+# Canned LLM output and chat history shared by the success-path tests
+CANNED_RESPONSE = MessageResponse(
+    response_1="Great to hear from you!",
+    response_2="Hey! How's it going?",
+    response_3="Nice to hear from you again!"
+)
+CANNED_CHAT_HISTORY = (
+    ChatMessage(contents="Hi there", is_from_me=False, created_at="2023-01-01T10:00:00Z"),
+    ChatMessage(contents="Hello!", is_from_me=True, created_at="2023-01-01T10:01:00Z"),
+)
+
+# Edge-case message contents, built once at import
+_LONG_CONTENT = "A" * 10000  # Very long message
+_UNICODE_CONTENT = "Hello 👋 这是中文 🎉 Émojis and spéciàl chars"
+
+# Raised by the mocked chat history lookup in the database error test
+_DB_ERROR = sqlite3.Error("Database connection failed")
+
+
+@pytest.fixture(scope="module")
+def valid_request():
+    """A valid request, shared because no test mutates it."""
+    return MessageRequest(
+        chat_id=123,
+        user_id="test_user",
+        contents="Hello world"
+    )
+
+
+@pytest.fixture(scope="module")
+def canned_response():
+    """The responses a mocked LLM client returns by default."""
+    return CANNED_RESPONSE
+
+
+@pytest.fixture(scope="module")
+def canned_chat_history():
+    """A short chat history returned by the mocked history lookup."""
+    return CANNED_CHAT_HISTORY
+
+
+class _StubLLM:
+    """Minimal stand-in for LLMClient that records prompts and returns a fixed response."""
+    
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+    
+    def generate_responses(self, prompt_data):
+        self.calls.append(prompt_data)
+        return self.response
+
+
+@pytest.fixture(scope="module")
+def api_module():
+    """The api module, imported on first use since it loads the Anthropic SDK."""
+    from src.message_maker import api
+    return api
+
+
+@pytest.fixture(scope="module")
+def llm_template():
+    """An autospecced LLMClient, built once per module since autospec introspects the class.
+    
+    Copies would share child mocks between tests, so llm_mock resets it instead.
+    """
+    from src.message_maker.llm_client import LLMClient
+    return create_autospec(LLMClient, instance=True)
+
+
+@pytest.fixture
+def llm_mock(llm_template, canned_response):
+    """An autospecced LLMClient that returns canned_response by default."""
+    llm_template.generate_responses.return_value = canned_response
+    yield llm_template
+    llm_template.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(autouse=True)
+def patched_api(monkeypatch, api_module, llm_mock):
+    """Replace the api module's LLM client and chat history lookup for every test.
+    
+    Tests reconfigure ``llm_client`` (the instance ``LLMClient()`` returns)
+    and ``get_chat_history`` through the yielded namespace.
+    """
+    patched = SimpleNamespace(
+        llm_client=llm_mock,
+        llm_client_class=Mock(return_value=llm_mock),
+        get_chat_history=Mock(return_value=[]),
+    )
+    monkeypatch.setattr(api_module, "LLMClient", patched.llm_client_class)
+    monkeypatch.setattr(api_module, "get_chat_history_for_message_generation", patched.get_chat_history)
+    yield patched
+
+
+@pytest.fixture
+def mock_service_class(monkeypatch, api_module, canned_response):
+    """Replace MessageMakerService for tests of the module-level wrapper."""
+    service_class = Mock()
+    service_class.return_value.generate_message_responses.return_value = canned_response
+    monkeypatch.setattr(api_module, "MessageMakerService", service_class)
+    return service_class
+
+
+@pytest.fixture
+def service(api_module, patched_api):
+    """A MessageMakerService wired to the patched LLM client."""
+    return api_module.MessageMakerService()
+
+
+# MessageMakerService
+
+def test_init_with_default_db_path(service):
+    """Test service initialization with default database path."""
+    assert service.db_path == "./data/messages.db"
+    assert service.llm_client is not None
+    assert service.logger is not None
+
+
+def test_close_releases_cached_connection(api_module, service, monkeypatch):
+    """Test closing the service closes the cached connection to its database."""
+    close_ro_connections = Mock()
+    monkeypatch.setattr(api_module, "close_ro_connections", close_ro_connections)
+    
+    service.close()
+    
+    close_ro_connections.assert_called_once_with("./data/messages.db")
+
+
+def test_init_with_custom_db_path(api_module):
+    """Test service initialization with custom database path."""
+    custom_path = "/custom/path/messages.db"
+    service = api_module.MessageMakerService(db_path=custom_path)
+    assert service.db_path == custom_path
+
+
+def test_generate_message_responses_success(service, patched_api, valid_request, canned_chat_history,
+                                            canned_response):
+    """Test successful message response generation."""
+    # Setup mocks
+    patched_api.get_chat_history.return_value = canned_chat_history
+    service.llm_client = stub_llm = _StubLLM(canned_response)
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.valid_request = MessageRequest(
-            chat_id=123,
-            user_id="test_user",
-            contents="Hello world"
-        )
+    # Execute
+    result = service.generate_message_responses(valid_request)
     
-    @patch('src.message_maker.api.LLMClient')
-    def test_init_with_default_db_path(self, mock_llm_client_class):
-        """Test service initialization with default database path."""
-        mock_llm_client_class.return_value = Mock()
-        service = MessageMakerService()
-        assert service.db_path == "./data/messages.db"
-        assert service.llm_client is not None
-        assert service.logger is not None
+    # Verify
+    assert isinstance(result, MessageResponse)
+    assert result.response_1 == "Great to hear from you!"
+    assert result.response_2 == "Hey! How's it going?"
+    assert result.response_3 == "Nice to hear from you again!"
     
-    @patch('src.message_maker.api.LLMClient')
-    def test_init_with_custom_db_path(self, mock_llm_client_class):
-        """Test service initialization with custom database path."""
-        mock_llm_client_class.return_value = Mock()
-        custom_path = "/custom/path/messages.db"
-        service = MessageMakerService(db_path=custom_path)
-        assert service.db_path == custom_path
+    # Verify chat history was retrieved with correct parameters
+    assert patched_api.get_chat_history.call_count == 1
+    assert patched_api.get_chat_history.call_args.kwargs == {
+        "chat_id": "123", "user_id": "test_user", "db_path": "./data/messages.db"
+    }
     
-    @patch('src.message_maker.api.get_chat_history_for_message_generation')
-    @patch('src.message_maker.api.LLMClient')
-    def test_generate_message_responses_success(self, mock_llm_client_class, mock_get_chat_history):
-        """Test successful message response generation."""
-        # Setup mocks
-        mock_chat_history = [
-            ChatMessage(contents="Hi there", is_from_me=False, created_at="2023-01-01T10:00:00Z"),
-            ChatMessage(contents="Hello!", is_from_me=True, created_at="2023-01-01T10:01:00Z")
-        ]
-        mock_get_chat_history.return_value = mock_chat_history
-        
-        mock_llm_client = Mock()
-        mock_response = MessageResponse(
-            response_1="Great to hear from you!",
-            response_2="Hey! How's it going?", 
-            response_3="Nice to hear from you again!"
-        )
-        mock_llm_client.generate_responses.return_value = mock_response
-        mock_llm_client_class.return_value = mock_llm_client
-        
-        # Execute
-        service = MessageMakerService()
-        result = service.generate_message_responses(self.valid_request)
-        
-        # Verify
-        assert isinstance(result, MessageResponse)
-        assert result.response_1 == "Great to hear from you!"
-        assert result.response_2 == "Hey! How's it going?"
-        assert result.response_3 == "Nice to hear from you again!"
-        
-        # Verify chat history was retrieved with correct parameters
-        mock_get_chat_history.assert_called_once_with(
-            chat_id="123",
-            user_id="test_user"
-        )
-        
-        # Verify LLM client was called with correct prompt data
-        mock_llm_client.generate_responses.assert_called_once()
-        call_args = mock_llm_client.generate_responses.call_args[0][0]
-        assert isinstance(call_args, LLMPromptData)
-        assert call_args.chat_history == mock_chat_history
-        assert call_args.new_message.contents == "Hello world"
+    # Verify LLM client was called with correct prompt data
+    assert len(stub_llm.calls) == 1
+    call_args = stub_llm.calls[0]
+    assert isinstance(call_args, LLMPromptData)
+    assert call_args.chat_history == canned_chat_history
+    assert call_args.new_message.contents == "Hello world"
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize("chat_id,user_id,contents,error", [
+    (-1, "test_user", "Hello world", "chat_id must be a positive integer"),
+    (123, "", "Hello world", "user_id must be a non-empty string"),
+    (123, "test_user", "", "contents must be a non-empty string"),
+], ids=["invalid_chat_id", "empty_user_id", "empty_contents"])
+def test_generate_message_responses_invalid_input(service, chat_id, user_id, contents, error):
+    """Test response generation rejects invalid requests."""
+    invalid_request = MessageRequest(
+        chat_id=chat_id,
+        user_id=user_id,
+        contents=contents
+    )
     
-    @patch('src.message_maker.api.LLMClient')
-    def test_generate_message_responses_invalid_input(self, mock_llm_client_class):
-        """Test response generation with invalid input."""
-        invalid_request = MessageRequest(
-            chat_id=-1,  # Invalid chat_id
-            user_id="test_user",
-            contents="Hello world"
-        )
-        
-        with pytest.raises(ValueError, match="chat_id must be a positive integer"):
-            service = MessageMakerService()
-            service.generate_message_responses(invalid_request)
+    with pytest.raises(ValueError) as exc_info:
+        service.generate_message_responses(invalid_request)
+    assert error in str(exc_info.value)
+
+
+def test_generate_message_responses_database_error(service, patched_api, valid_request):
+    """Test response generation with database error."""
+    patched_api.get_chat_history.side_effect = _DB_ERROR
     
-    @patch('src.message_maker.api.LLMClient')
-    def test_generate_message_responses_empty_user_id(self, mock_llm_client_class):
-        """Test response generation with empty user_id."""
-        invalid_request = MessageRequest(
-            chat_id=123,
-            user_id="",  # Empty user_id
-            contents="Hello world"
-        )
-        
-        with pytest.raises(ValueError, match="user_id must be a non-empty string"):
-            service = MessageMakerService()
-            service.generate_message_responses(invalid_request)
+    with pytest.raises(Exception, match="Database error"):
+        service.generate_message_responses(valid_request)
+
+
+def test_generate_message_responses_llm_error(service, patched_api, valid_request):
+    """Test response generation with LLM API error."""
+    # Setup mocks
+    patched_api.llm_client.generate_responses.side_effect = Exception("LLM API unavailable")
     
-    @patch('src.message_maker.api.LLMClient')
-    def test_generate_message_responses_empty_contents(self, mock_llm_client_class):
-        """Test response generation with empty contents."""
-        invalid_request = MessageRequest(
-            chat_id=123,
-            user_id="test_user",
-            contents=""  # Empty contents
-        )
-        
-        with pytest.raises(ValueError, match="contents must be a non-empty string"):
-            service = MessageMakerService()
-            service.generate_message_responses(invalid_request)
+    with pytest.raises(Exception, match="LLM API error"):
+        service.generate_message_responses(valid_request)
+
+
+def test_generate_message_responses_empty_chat_history(service, patched_api, valid_request, canned_response):
+    """Test response generation with empty chat history."""
+    # Setup mocks
+    patched_api.get_chat_history.return_value = []  # Empty chat history
+    service.llm_client = _StubLLM(canned_response)
     
-    @patch('src.message_maker.api.get_chat_history_for_message_generation')
-    @patch('src.message_maker.api.LLMClient')
-    def test_generate_message_responses_database_error(self, mock_llm_client_class, mock_get_chat_history):
-        """Test response generation with database error."""
-        mock_get_chat_history.side_effect = sqlite3.Error("Database connection failed")
-        
-        with pytest.raises(Exception, match="Database error"):
-            service = MessageMakerService()
-            service.generate_message_responses(self.valid_request)
+    # Execute
+    result = service.generate_message_responses(valid_request)
     
-    @patch('src.message_maker.api.get_chat_history_for_message_generation')
-    @patch('src.message_maker.api.LLMClient')
-    def test_generate_message_responses_llm_error(self, mock_llm_client_class, mock_get_chat_history):
-        """Test response generation with LLM API error."""
-        # Setup mocks
-        mock_get_chat_history.return_value = []
-        mock_llm_client = Mock()
-        mock_llm_client.generate_responses.side_effect = Exception("LLM API unavailable")
-        mock_llm_client_class.return_value = mock_llm_client
-        
-        with pytest.raises(Exception, match="LLM API error"):
-            service = MessageMakerService()
-            service.generate_message_responses(self.valid_request)
+    # Verify it still works with empty history
+    assert isinstance(result, MessageResponse)
+    assert result.response_1 == canned_response.response_1
+
+
+@pytest.mark.parametrize("side_effect,expected_exc", [
+    (None, None),
+    (ValueError("Invalid input"), ValueError),
+], ids=["success", "error_propagation"])
+def test_generate_message_responses_function(api_module, mock_service_class, valid_request,
+                                             canned_response, side_effect, expected_exc):
+    """Test the standalone function creates a service and delegates to it."""
+    mock_service = mock_service_class.return_value
+    mock_service.generate_message_responses.side_effect = side_effect
     
-    @patch('src.message_maker.api.get_chat_history_for_message_generation')
-    @patch('src.message_maker.api.LLMClient')
-    def test_generate_message_responses_empty_chat_history(self, mock_llm_client_class, mock_get_chat_history):
-        """Test response generation with empty chat history."""
-        # Setup mocks
-        mock_get_chat_history.return_value = []  # Empty chat history
-        mock_llm_client = Mock()
-        mock_response = MessageResponse(
-            response_1="Hello there!",
-            response_2="Hi!",
-            response_3="Hey!"
-        )
-        mock_llm_client.generate_responses.return_value = mock_response
-        mock_llm_client_class.return_value = mock_llm_client
-        
-        # Execute
-        service = MessageMakerService()
-        result = service.generate_message_responses(self.valid_request)
-        
-        # Verify it still works with empty history
-        assert isinstance(result, MessageResponse)
-        assert result.response_1 == "Hello there!"
-
-
-class TestGenerateMessageResponsesFunction:
-    """Test cases for the standalone generate_message_responses function."""
+    if expected_exc is None:
+        assert api_module.generate_message_responses(valid_request) == canned_response
+    else:
+        with pytest.raises(expected_exc):
+            api_module.generate_message_responses(valid_request)
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.valid_request = MessageRequest(
-            chat_id=456,
-            user_id="standalone_user",
-            contents="Test message"
-        )
+    mock_service_class.assert_called_once_with()
+    mock_service.generate_message_responses.assert_called_once_with(valid_request, 2000)
+    mock_service.close.assert_called_once_with()
+
+
+def test_generate_message_responses_function_with_custom_context_limit(api_module, mock_service_class,
+                                                                      valid_request, canned_response):
+    """Test the standalone function with custom max_context_messages parameter."""
+    result = api_module.generate_message_responses(valid_request, max_context_messages=500)
     
-    @patch('src.message_maker.api.MessageMakerService')
-    def test_generate_message_responses_function_success(self, mock_service_class):
-        """Test the standalone function creates service and calls method."""
-        # Setup mock
-        mock_service = Mock()
-        mock_response = MessageResponse(
-            response_1="Response 1",
-            response_2="Response 2", 
-            response_3="Response 3"
-        )
-        mock_service.generate_message_responses.return_value = mock_response
-        mock_service_class.return_value = mock_service
-        
-        # Execute
-        result = generate_message_responses(self.valid_request)
-        
-        # Verify
-        assert result == mock_response
-        mock_service_class.assert_called_once_with()
-        mock_service.generate_message_responses.assert_called_once_with(self.valid_request, 2000)
+    assert result == canned_response
+    mock_service_class.assert_called_once_with()
+    mock_service_class.return_value.generate_message_responses.assert_called_once_with(valid_request, 500)
+
+
+# Integration scenarios
+
+@pytest.mark.integration
+def test_typical_conversation_flow(service, canned_response):
+    """Test the incoming message reaches the LLM client as the new message."""
+    service.llm_client = stub_llm = _StubLLM(canned_response)
+    request = MessageRequest(
+        chat_id=789,
+        user_id="conversation_user",
+        contents="How about 12:30 at that new Italian place?"
+    )
     
-    @patch('src.message_maker.api.MessageMakerService')
-    def test_generate_message_responses_function_error_propagation(self, mock_service_class):
-        """Test that the standalone function properly propagates errors."""
-        # Setup mock to raise error
-        mock_service = Mock()
-        mock_service.generate_message_responses.side_effect = ValueError("Invalid input")
-        mock_service_class.return_value = mock_service
-        
-        # Execute and verify error is propagated
-        with pytest.raises(ValueError, match="Invalid input"):
-            generate_message_responses(self.valid_request)
-
-    @patch('src.message_maker.api.MessageMakerService')
-    def test_generate_message_responses_function_with_custom_context_limit(self, mock_service_class):
-        """Test the standalone function with custom max_context_messages parameter."""
-        # Setup mock
-        mock_service = Mock()
-        mock_response = MessageResponse(
-            response_1="Response 1",
-            response_2="Response 2", 
-            response_3="Response 3"
-        )
-        mock_service.generate_message_responses.return_value = mock_response
-        mock_service_class.return_value = mock_service
-        
-        # Execute with custom context limit
-        result = generate_message_responses(self.valid_request, max_context_messages=500)
-        
-        # Verify
-        assert result == mock_response
-        mock_service_class.assert_called_once_with()
-        mock_service.generate_message_responses.assert_called_once_with(self.valid_request, 500)
-
-
-class TestIntegrationScenarios:
-    """Integration test scenarios for different use cases."""
+    service.generate_message_responses(request)
     
-    @patch('src.message_maker.api.get_chat_history_for_message_generation')
-    @patch('src.message_maker.api.LLMClient')
-    def test_typical_conversation_flow(self, mock_llm_client_class, mock_get_chat_history):
-        """Test a typical conversation flow with realistic chat history."""
-        # Setup realistic chat history
-        mock_chat_history = [
-            ChatMessage(contents="Hey, are you free for lunch tomorrow?", is_from_me=False, created_at="2023-01-01T09:00:00Z"),
-            ChatMessage(contents="Yeah! What time works for you?", is_from_me=True, created_at="2023-01-01T09:05:00Z"),
-            ChatMessage(contents="How about 12:30 at that new Italian place?", is_from_me=False, created_at="2023-01-01T09:10:00Z")
-        ]
-        mock_get_chat_history.return_value = mock_chat_history
-        
-        # Setup LLM response
-        mock_llm_client = Mock()
-        mock_response = MessageResponse(
-            response_1="Sounds perfect! See you there at 12:30",
-            response_2="Great choice! I'll meet you at 12:30",
-            response_3="Perfect timing! Looking forward to trying that place"
-        )
-        mock_llm_client.generate_responses.return_value = mock_response
-        mock_llm_client_class.return_value = mock_llm_client
-        
-        # Create request
-        request = MessageRequest(
-            chat_id=789,
-            user_id="conversation_user",
-            contents="How about 12:30 at that new Italian place?"
-        )
-        
-        # Execute
-        service = MessageMakerService()
-        result = service.generate_message_responses(request)
-        
-        # Verify realistic responses
-        assert "12:30" in result.response_1
-        assert isinstance(result, MessageResponse)
+    assert [call.new_message.contents for call in stub_llm.calls] == [request.contents]
+
+
+@pytest.mark.fast
+def test_edge_case_very_long_content():
+    """Test handling of very long message content."""
+    request = MessageRequest(
+        chat_id=999,
+        user_id="long_user",
+        contents=_LONG_CONTENT
+    )
     
-    def test_edge_case_very_long_content(self):
-        """Test handling of very long message content."""
-        long_content = "A" * 10000  # Very long message
-        request = MessageRequest(
-            chat_id=999,
-            user_id="long_user",
-            contents=long_content
-        )
-        
-        # Should not raise validation error for long content
-        try:
-            request.validate()
-        except ValueError:
-            pytest.fail("Validation should not fail for long content")
+    # Should not raise validation error for long content
+    try:
+        request.validate()
+    except ValueError:
+        pytest.fail("Validation should not fail for long content")
+
+
+@pytest.mark.fast
+def test_edge_case_unicode_content():
+    """Test handling of unicode and special characters."""
+    request = MessageRequest(
+        chat_id=888,
+        user_id="unicode_user",
+        contents=_UNICODE_CONTENT
+    )
     
-    def test_edge_case_unicode_content(self):
-        """Test handling of unicode and special characters."""
-        unicode_content = "Hello 👋 这是中文 🎉 Émojis and spéciàl chars"
-        request = MessageRequest(
-            chat_id=888,
-            user_id="unicode_user",
-            contents=unicode_content
-        )
-        
-        # Should not raise validation error for unicode content
-        try:
-            request.validate()
-        except ValueError:
-            pytest.fail("Validation should not fail for unicode content")
\ No newline at end of file
+    # Should not raise validation error for unicode content
+    try:
+        request.validate()
+    except ValueError:
+        pytest.fail("Validation should not fail for unicode content")
\ No newline at end of file
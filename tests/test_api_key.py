@@ -2,15 +2,13 @@
 """Quick test script to verify Anthropic API key is working."""
 
 import os
-import sys
-sys.path.append('src')
 
 # Load .env file for local development
 from src.utils.load_env import load_env
 load_env()
 
-from message_maker.llm_client import LLMClient
-from message_maker.types import LLMPromptData, ChatMessage, NewMessage
+from src.message_maker.llm_client import LLMClient
+from src.message_maker.types import LLMPromptData, ChatMessage, NewMessage
 
 def test_api_key():
     """Test if API key is properly configured and working."""
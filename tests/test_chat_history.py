@@ -1,186 +1,136 @@
 #!/usr/bin/env python3
 """Unit tests for core chat history retrieval functionality."""
 
+import hashlib
 import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
-import sys
-from unittest.mock import patch
+from unittest.mock import Mock, patch
+
+from src.message_maker.chat_history import (
+    CHAT_HISTORY_SQL,
+    _get_ro_connection,
+    close_ro_connections,
+    get_chat_history_for_message_generation,
+)
+from src.database.messages_db import MessagesDatabase
+from tests.memory_db import MemoryDatabaseTestCase, MemoryTemplateTestCase
 
-# Add the project root to the path so we can import our modules
-sys.path.append(str(Path(__file__).parent.parent))
+MISSING_DB_URI = "file:/nonexistent/chat_history_test.db?mode=ro"
 
-from src.message_maker.chat_history import get_chat_history_for_message_generation
-from src.message_maker.types import ChatMessage
-from src.database.messages_db import MessagesDatabase
+# Edge-case message contents, built once at import
+_LARGE_CONTENT = "A" * 10000  # 10KB
+_SPECIAL_CONTENT = "Hello! 🎉 こんにちは Special chars: @#$%^&*()[]{}|\\:;\"'<>,.?/"
 
 
-class TestChatHistoryFunction(unittest.TestCase):
-    """Unit tests for get_chat_history_for_message_generation function."""
+def _digest(text):
+    """Short fixed-size digest of text, for comparing large contents."""
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
 
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create a temporary database for testing
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-        self.temp_db.close()
-        self.db_path = self.temp_db.name
 
-        # Initialize database
-        self.messages_db = MessagesDatabase(self.db_path)
-        self.assertTrue(self.messages_db.create_database())
+class ChatHistoryTemplateCase(MemoryTemplateTestCase):
+    """Base for chat history tests; builds one seeded template database per class."""
 
-        # Set up test data
-        self._setup_test_data()
+    test_chat_id = 123
+    test_chat_id_str = str(test_chat_id)
+    # Seeded with a participant but no messages
+    empty_chat_id = 999
 
-    def tearDown(self):
-        """Clean up test fixtures."""
-        # Remove the temporary database file
-        Path(self.db_path).unlink(missing_ok=True)
-
-    def _setup_test_data(self):
-        """Set up test data in the database."""
-        # Insert test users
-        test_users = [
-            {
-                "user_id": "user1",
-                "first_name": "Alice",
-                "last_name": "Smith",
-                "phone_number": "+1234567890",
-                "email": "alice@example.com",
-                "handle_id": 1
-            },
-            {
-                "user_id": "user2", 
-                "first_name": "Bob",
-                "last_name": "Jones",
-                "phone_number": "+1987654321",
-                "email": "bob@example.com",
-                "handle_id": 2
-            }
+    @classmethod
+    def setUpClass(cls):
+        """Build the populated template database once for the whole class."""
+        super().setUpClass()
+        cls._history_cache = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Release the template database."""
+        # Lookups by path cache a connection that also keeps it alive
+        close_ro_connections(cls.template_db_path)
+        super().tearDownClass()
+
+    @classmethod
+    def _history(cls, user_id):
+        """Chat history of the seeded chat, read once per user from the template.
+
+        Only for tests that read without mutating; the template never changes.
+        """
+        if user_id not in cls._history_cache:
+            cls._history_cache[user_id] = get_chat_history_for_message_generation(
+                chat_id=cls.test_chat_id_str,
+                user_id=user_id,
+                conn=cls.template_conn
+            )
+        return cls._history_cache[user_id]
+
+    @classmethod
+    def populate_template(cls, db_path):
+        """Set up test data in the database in a single transaction."""
+        users_rows = [
+            ("user1", "Alice", "Smith", "+1234567890", "alice@example.com", 1),
+            ("user2", "Bob", "Jones", "+1987654321", "bob@example.com", 2),
+        ]
+        messages_rows = [
+            (1, "user1", "Hello there!", True, "2023-01-01T10:00:00Z"),
+            (2, "user2", "Hi! How are you?", False, "2023-01-01T10:01:00Z"),
+            (3, "user1", "I'm doing great, thanks!", True, "2023-01-01T10:02:00Z"),
+            (4, "user2", "That's wonderful to hear!", False, "2023-01-01T10:03:00Z"),
+        ]
+        chat_messages_rows = [
+            (cls.test_chat_id, message_id, created_at)
+            for message_id, _, _, _, created_at in messages_rows
         ]
 
-        for user_data in test_users:
-            from src.user.user import User
-            user = User(**user_data)
-            self.messages_db.insert_user(user)
-
-        # Insert test chat
-        self.test_chat_id = 123
-        self.messages_db.insert_chat(
-            chat_id=self.test_chat_id,
-            display_name="Test Chat",
-            user_ids=["user1", "user2"]
+        assert MessagesDatabase(db_path).bulk_load(
+            users=users_rows,
+            chats=[(cls.test_chat_id, "Test Chat"), (cls.empty_chat_id, "Empty Chat")],
+            chat_users=[(cls.test_chat_id, "user1"), (cls.test_chat_id, "user2"), (cls.empty_chat_id, "user1")],
+            messages=messages_rows,
+            chat_messages=chat_messages_rows,
         )
 
-        # Insert test messages
-        test_messages = [
-            {
-                "message_id": 1,
-                "user_id": "user1",
-                "contents": "Hello there!",
-                "is_from_me": True,
-                "created_at": "2023-01-01T10:00:00Z"
-            },
-            {
-                "message_id": 2,
-                "user_id": "user2", 
-                "contents": "Hi! How are you?",
-                "is_from_me": False,
-                "created_at": "2023-01-01T10:01:00Z"
-            },
-            {
-                "message_id": 3,
-                "user_id": "user1",
-                "contents": "I'm doing great, thanks!",
-                "is_from_me": True,
-                "created_at": "2023-01-01T10:02:00Z"
-            },
-            {
-                "message_id": 4,
-                "user_id": "user2",
-                "contents": "That's wonderful to hear!",
-                "is_from_me": False,
-                "created_at": "2023-01-01T10:03:00Z"
-            }
-        ]
 
-        for msg in test_messages:
-            self.messages_db.insert_message(**msg)
-
-        # Insert chat-message relationships
-        chat_messages = [
-            {
-                "chat_id": self.test_chat_id,
-                "message_id": 1,
-                "message_date": "2023-01-01T10:00:00Z"
-            },
-            {
-                "chat_id": self.test_chat_id,
-                "message_id": 2,
-                "message_date": "2023-01-01T10:01:00Z"
-            },
-            {
-                "chat_id": self.test_chat_id,
-                "message_id": 3,
-                "message_date": "2023-01-01T10:02:00Z"
-            },
-            {
-                "chat_id": self.test_chat_id,
-                "message_id": 4,
-                "message_date": "2023-01-01T10:03:00Z"
-            }
-        ]
+class TestChatHistoryReadOnly(ChatHistoryTemplateCase):
+    """Read-only lookups, all run directly against the shared template.
 
-        for cm in chat_messages:
-            self.messages_db.insert_chat_message(**cm)
+    Nothing here writes, so tests skip the per-test copy entirely.
+    """
 
-    @patch('src.message_maker.chat_history.Path')
-    def test_get_chat_history_success(self, mock_path):
+    def test_get_chat_history_success(self):
         """Test successful retrieval of chat history."""
-        # Mock the database path to use our test database
-        mock_path.return_value = Path(self.db_path)
-
         # Test from user1's perspective
-        messages = get_chat_history_for_message_generation(
-            chat_id=str(self.test_chat_id), 
-            user_id="user1"
-        )
+        messages = self._history("user1")
 
         # Verify we got all messages
         self.assertEqual(len(messages), 4)
 
-        # Verify chronological order (oldest first)
-        expected_contents = [
-            "Hello there!",
-            "Hi! How are you?", 
-            "I'm doing great, thanks!",
-            "That's wonderful to hear!"
+        # Verify chronological order (oldest first) and is_from_me relative to user1
+        expected = (
+            ("Hello there!", True),
+            ("Hi! How are you?", False),
+            ("I'm doing great, thanks!", True),
+            ("That's wonderful to hear!", False),
+        )
+        actual = tuple((msg.contents, msg.is_from_me) for msg in messages)
+        self.assertEqual(actual, expected)
+
+    def test_chat_history_query_uses_ordered_index(self):
+        """Test the history query reads chat_messages in date order without sorting."""
+        plan = [
+            row[3] for row in self.template_conn.execute(
+                "EXPLAIN QUERY PLAN " + CHAT_HISTORY_SQL, (self.test_chat_id,)
+            )
         ]
-        actual_contents = [msg.contents for msg in messages]
-        self.assertEqual(actual_contents, expected_contents)
 
-        # Verify is_from_me is correctly set relative to user1
-        expected_is_from_me = [True, False, True, False]
-        actual_is_from_me = [msg.is_from_me for msg in messages]
-        self.assertEqual(actual_is_from_me, expected_is_from_me)
+        self.assertTrue(any("idx_chat_messages_chat_date" in step for step in plan), plan)
+        self.assertFalse(any("TEMP B-TREE" in step for step in plan), plan)
 
-    @patch('src.message_maker.chat_history.Path')
-    def test_get_chat_history_consistent_is_from_me(self, mock_path):
+    def test_get_chat_history_consistent_is_from_me(self):
         """Test that is_from_me is consistent regardless of user_id parameter."""
-        # Mock the database path to use our test database
-        mock_path.return_value = Path(self.db_path)
-
         # Test with different user_id parameters
-        messages1 = get_chat_history_for_message_generation(
-            chat_id=str(self.test_chat_id),
-            user_id="user1"
-        )
-        
-        messages2 = get_chat_history_for_message_generation(
-            chat_id=str(self.test_chat_id),
-            user_id="user2"
-        )
+        messages1 = self._history("user1")
+        messages2 = self._history("user2")
 
         # In the implicit "me" data model, is_from_me should be the same
         # regardless of user_id parameter since it's stored in the database
@@ -192,86 +142,29 @@ class TestChatHistoryFunction(unittest.TestCase):
         expected_is_from_me = [True, False, True, False]
         self.assertEqual(is_from_me_1, expected_is_from_me)
 
-    @patch('src.message_maker.chat_history.Path')
-    def test_get_chat_history_empty_chat(self, mock_path):
+    def test_get_chat_history_empty_chat(self):
         """Test retrieval for empty chat."""
-        # Mock the database path to use our test database
-        mock_path.return_value = Path(self.db_path)
-
-        # Create empty chat
-        empty_chat_id = 999
-        self.messages_db.insert_chat(
-            chat_id=empty_chat_id,
-            display_name="Empty Chat",
-            user_ids=["user1"]
-        )
-
         messages = get_chat_history_for_message_generation(
-            chat_id=str(empty_chat_id),
-            user_id="user1"
+            chat_id=str(self.empty_chat_id),
+            user_id="user1",
+            conn=self.template_conn
         )
 
         self.assertEqual(len(messages), 0)
 
-    def test_get_chat_history_invalid_chat_id(self):
-        """Test error handling for invalid chat_id formats."""
-        # Test non-numeric chat_id
-        with self.assertRaises(ValueError) as context:
-            get_chat_history_for_message_generation(
-                chat_id="invalid",
-                user_id="user1"
-            )
-        self.assertIn("must be convertible to integer", str(context.exception))
-
-        # Test None chat_id
-        with self.assertRaises(ValueError):
-            get_chat_history_for_message_generation(
-                chat_id=None,
-                user_id="user1"
-            )
-
-        # Test empty string chat_id
-        with self.assertRaises(ValueError):
-            get_chat_history_for_message_generation(
-                chat_id="",
-                user_id="user1"
-            )
-
-    @patch('src.message_maker.chat_history.Path')
-    def test_get_chat_history_nonexistent_chat(self, mock_path):
+    def test_get_chat_history_nonexistent_chat(self):
         """Test retrieval for nonexistent chat."""
-        # Mock the database path to use our test database
-        mock_path.return_value = Path(self.db_path)
-
         messages = get_chat_history_for_message_generation(
             chat_id="99999",
-            user_id="user1"
+            user_id="user1",
+            db_path=self.template_db_path
         )
 
         self.assertEqual(len(messages), 0)
 
-    @patch('src.message_maker.chat_history.sqlite3.connect')
-    def test_database_error_handling(self, mock_connect):
-        """Test proper handling of database errors."""
-        # Mock database error
-        mock_connect.side_effect = sqlite3.Error("Database connection failed")
-
-        with self.assertRaises(sqlite3.Error):
-            get_chat_history_for_message_generation(
-                chat_id=str(self.test_chat_id),
-                user_id="user1"
-            )
-
-    @patch('src.message_maker.chat_history.Path')
-    def test_chat_message_validation(self, mock_path):
+    def test_chat_message_validation(self):
         """Test that retrieved messages are properly validated."""
-        # Mock the database path to use our test database
-        mock_path.return_value = Path(self.db_path)
-
-        messages = get_chat_history_for_message_generation(
-            chat_id=str(self.test_chat_id),
-            user_id="user1"
-        )
+        messages = self._history("user1")
 
         # Verify each message is valid
         for message in messages:
@@ -285,77 +178,172 @@ class TestChatHistoryFunction(unittest.TestCase):
             self.assertIsInstance(message.created_at, str)
             self.assertTrue(len(message.created_at) > 0)
 
-    @patch('src.message_maker.chat_history.Path')
-    def test_message_order_consistency(self, mock_path):
+    def test_message_order_consistency(self):
         """Test that message ordering is consistent across multiple calls."""
-        # Mock the database path to use our test database
-        mock_path.return_value = Path(self.db_path)
-
-        # Get messages multiple times
+        # Get messages multiple times, once through the path and once on a passed connection
         messages1 = get_chat_history_for_message_generation(
-            chat_id=str(self.test_chat_id),
-            user_id="user1"
+            chat_id=self.test_chat_id_str,
+            user_id="user1",
+            db_path=self.template_db_path
         )
         
         messages2 = get_chat_history_for_message_generation(
-            chat_id=str(self.test_chat_id),
-            user_id="user1"
+            chat_id=self.test_chat_id_str,
+            user_id="user1",
+            conn=self.template_conn
         )
 
-        # Should have same order
-        self.assertEqual(len(messages1), len(messages2))
-        for i, (msg1, msg2) in enumerate(zip(messages1, messages2)):
-            self.assertEqual(msg1.contents, msg2.contents, f"Message {i} contents differ")
-            self.assertEqual(msg1.is_from_me, msg2.is_from_me, f"Message {i} is_from_me differs")
-            self.assertEqual(msg1.created_at, msg2.created_at, f"Message {i} created_at differs")
+        # Should have same order; ChatMessage equality compares every field
+        self.assertEqual(len(messages1), 4)
+        self.assertEqual(messages1, messages2)
+
+    def test_get_chat_history_reuses_given_connection(self):
+        """Test that a passed connection is used and left open."""
+        with patch('src.message_maker.chat_history.sqlite3.connect') as mock_connect:
+            for _ in range(2):
+                messages = get_chat_history_for_message_generation(
+                    chat_id=self.test_chat_id_str,
+                    user_id="user1",
+                    conn=self.template_conn
+                )
+                self.assertEqual(len(messages), 4)
+
+        mock_connect.assert_not_called()
+        # Still usable, so the lookup didn't close it
+        self.template_conn.execute("SELECT 1")
+
+    def test_get_chat_history_caches_read_only_connection(self):
+        """Test that lookups by path share one read-only connection."""
+        close_ro_connections(self.template_db_path)
+        for _ in range(2):
+            get_chat_history_for_message_generation(
+                chat_id=self.test_chat_id_str,
+                user_id="user1",
+                db_path=self.template_db_path
+            )
 
-    @patch('src.message_maker.chat_history.Path')
-    def test_large_message_content(self, mock_path):
-        """Test handling of very large message content."""
-        # Mock the database path to use our test database
-        mock_path.return_value = Path(self.db_path)
+        conn = _get_ro_connection(self.template_db_path)
+        self.assertIs(_get_ro_connection(self.template_db_path), conn)
+        with self.assertRaises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM messages")
 
-        # Create a large message (10KB)
-        large_content = "A" * 10000
-        
+        # Closing drops it from the cache; the next lookup opens a new one
+        close_ro_connections(self.template_db_path)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        self.assertIsNot(_get_ro_connection(self.template_db_path), conn)
+
+
+class TestChatHistoryFunction(ChatHistoryTemplateCase, MemoryDatabaseTestCase):
+    """Lookups over data a test adds, each on its own copy of the template."""
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        # Lookups by path cache a connection that would keep the copy alive
+        close_ro_connections(self.db_path)
+        super().tearDown()
+
+    def test_large_message_content(self):
+        """Test handling of very large message content."""
         # Set up test data with large message
         large_chat_id = 888
         self.messages_db.insert_chat(large_chat_id, "Large Message Chat", ["user1"])
         
-        self.messages_db.insert_message(999, "user1", large_content, True, "2023-01-01T10:00:00Z")
+        self.messages_db.insert_message(999, "user1", _LARGE_CONTENT, True, "2023-01-01T10:00:00Z")
         self.messages_db.insert_chat_message(large_chat_id, 999, "2023-01-01T10:00:00Z")
 
         # Should handle large content without issues
         messages = get_chat_history_for_message_generation(
-            str(large_chat_id), "user1"
+            str(large_chat_id), "user1", db_path=self.db_path
         )
         
         self.assertEqual(len(messages), 1)
-        self.assertEqual(messages[0].contents, large_content)
+        # Compare length and digest so a mismatch doesn't render a 10KB diff
+        self.assertEqual(len(messages[0].contents), len(_LARGE_CONTENT))
+        self.assertEqual(_digest(messages[0].contents), _digest(_LARGE_CONTENT))
 
-    @patch('src.message_maker.chat_history.Path')
-    def test_special_characters_in_messages(self, mock_path):
+    def test_special_characters_in_messages(self):
         """Test handling of special characters and Unicode in messages."""
-        # Mock the database path to use our test database
-        mock_path.return_value = Path(self.db_path)
-
-        special_content = "Hello! 🎉 こんにちは Special chars: @#$%^&*()[]{}|\\:;\"'<>,.?/"
-        
         # Set up test data
         special_chat_id = 777
         self.messages_db.insert_chat(special_chat_id, "Special Chars Chat", ["user1"])
         
-        self.messages_db.insert_message(888, "user1", special_content, True, "2023-01-01T10:00:00Z")
+        self.messages_db.insert_message(888, "user1", _SPECIAL_CONTENT, True, "2023-01-01T10:00:00Z")
         self.messages_db.insert_chat_message(special_chat_id, 888, "2023-01-01T10:00:00Z")
 
         # Should handle special characters without issues
         messages = get_chat_history_for_message_generation(
-            str(special_chat_id), "user1"
+            str(special_chat_id), "user1", db_path=self.db_path
         )
         
         self.assertEqual(len(messages), 1)
-        self.assertEqual(messages[0].contents, special_content)
+        self.assertEqual(messages[0].contents, _SPECIAL_CONTENT)
+
+
+class TestChatHistoryErrors(unittest.TestCase):
+    """chat_id parsing and error paths of get_chat_history_for_message_generation.
+
+    These never reach a real database, so the class has no fixtures.
+    """
+
+    def test_get_chat_history_invalid_chat_id(self):
+        """Test error handling for invalid chat_id formats."""
+        for bad_chat_id in ("invalid", None, ""):
+            with self.subTest(chat_id=bad_chat_id):
+                with self.assertRaises(ValueError) as context:
+                    get_chat_history_for_message_generation(
+                        chat_id=bad_chat_id,
+                        user_id="user1"
+                    )
+                self.assertIn("must be convertible to integer", str(context.exception))
+
+    def test_numeric_string_chat_id_variations(self):
+        """Test which numeric chat_id strings are converted to the integer id."""
+        # Passed in directly, so nothing has to be patched in the module
+        conn = Mock()
+        cursor = conn.cursor.return_value
+        cursor.execute.return_value = []
+
+        for chat_id in ("123", " 123 "):
+            with self.subTest(chat_id=chat_id):
+                self.assertEqual(get_chat_history_for_message_generation(chat_id, "user1", conn=conn), [])
+                self.assertEqual(cursor.execute.call_args.args[1], (123,))
+
+        with self.subTest(chat_id="123.0"):
+            with self.assertRaises(ValueError):
+                get_chat_history_for_message_generation("123.0", "user1", conn=conn)
+
+    def test_database_error_handling(self):
+        """Test proper handling of database errors."""
+        # Opening a missing database read-only fails inside sqlite3.connect itself
+        with self.subTest("connect"), self.assertRaises(sqlite3.Error):
+            get_chat_history_for_message_generation(
+                chat_id="123",
+                user_id="user1",
+                db_path=MISSING_DB_URI
+            )
+
+        # Plain paths are opened read-only too, so a missing file isn't created
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            missing_path = Path(tmp_dir) / "messages.db"
+            with self.subTest("missing path"), self.assertRaises(sqlite3.Error):
+                get_chat_history_for_message_generation(
+                    chat_id="123",
+                    user_id="user1",
+                    db_path=missing_path
+                )
+            self.assertFalse(missing_path.exists())
+
+        # A closed connection fails once the query is attempted
+        closed_conn = sqlite3.connect(":memory:")
+        closed_conn.close()
+        with self.subTest("query"), self.assertRaises(sqlite3.Error):
+            get_chat_history_for_message_generation(
+                chat_id="123",
+                user_id="user1",
+                conn=closed_conn
+            )
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -2,39 +2,57 @@
 """Comprehensive tests for chats table functionality"""
 
 import sqlite3
-import tempfile
 import unittest
-from pathlib import Path
 from unittest.mock import Mock, patch
-import sys
 
-# Add the src directory to the path so we can import our modules
-sys.path.append(str(Path(__file__).parent.parent))
-
-from src.database.messages_db import MessagesDatabase
+from src.database.messages_db import CHATS_BY_DISPLAY_NAME_SQL, MessagesDatabase
 from src.user.user import User
-
-
-class TestChatsTable(unittest.TestCase):
+from tests.memory_db import MemoryDatabaseTestCase, copy_memory_db, memory_db_uri
+
+# Mock Messages app chat tables and seed data, built in one script
+MOCK_CHAT_SOURCE_SQL = """
+    BEGIN;
+
+    CREATE TABLE chat (
+        ROWID INTEGER PRIMARY KEY,
+        display_name TEXT,
+        chat_identifier TEXT,
+        service_name TEXT
+    );
+
+    CREATE TABLE handle (
+        ROWID INTEGER PRIMARY KEY,
+        id TEXT NOT NULL,
+        service TEXT NOT NULL
+    );
+
+    CREATE TABLE chat_handle_join (
+        chat_id INTEGER,
+        handle_id INTEGER
+    );
+
+    -- Chat 1: Quantabes, Chat 2: Test Group
+    INSERT INTO chat VALUES
+        (1, 'Quantabes', '+12345678901', 'iMessage'),
+        (2, 'Test Group', 'chat123', 'iMessage');
+
+    INSERT INTO handle VALUES
+        (101, '+12345678901', 'iMessage'),
+        (102, '+12345678902', 'iMessage'),
+        (103, '+12345678903', 'iMessage');
+
+    INSERT INTO chat_handle_join VALUES
+        (1, 101),
+        (1, 102),
+        (2, 103);
+
+    COMMIT;
+"""
+
+
+class TestChatsTable(MemoryDatabaseTestCase):
     """Test cases for chats table creation and operations"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        # Create a temporary database for testing
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-        self.temp_db.close()
-        self.db_path = self.temp_db.name
-
-        self.messages_db = MessagesDatabase(self.db_path)
-
-        # Create the database and tables
-        self.assertTrue(self.messages_db.create_database())
-
-    def tearDown(self):
-        """Clean up test fixtures"""
-        # Remove the temporary database file
-        Path(self.db_path).unlink(missing_ok=True)
-
     def test_chats_table_creation(self):
         """Test that chats table is created with correct schema"""
         # Check that chats table exists
@@ -118,10 +136,12 @@ class TestChatsTable(unittest.TestCase):
         inserted_count = self.messages_db.insert_chats_batch(chats)
         self.assertEqual(inserted_count, 3)
 
-        # Verify each chat was inserted correctly
+        # Verify each chat was inserted correctly, fetched in one lookup;
+        # chat_id is stored as an integer
+        fetched = self.messages_db.get_chats_by_ids([int(c["chat_id"]) for c in chats])
+        self.assertEqual(len(fetched), len(chats))
         for chat_data in chats:
-            chat = self.messages_db.get_chat_by_id(chat_data["chat_id"])
-            self.assertIsNotNone(chat)
+            chat = fetched[int(chat_data["chat_id"])]
             self.assertEqual(chat["display_name"], chat_data["display_name"])
             self.assertEqual(chat["user_ids"], chat_data["user_ids"])
 
@@ -130,6 +150,15 @@ class TestChatsTable(unittest.TestCase):
         chat = self.messages_db.get_chat_by_id(99999)
         self.assertIsNone(chat)
 
+    def test_get_chats_by_ids_skips_missing(self):
+        """Test that chats that don't exist are left out of a bulk lookup"""
+        self.messages_db.insert_chat(300, "Present", ["user1"])
+
+        fetched = self.messages_db.get_chats_by_ids([300, 99999])
+        self.assertEqual(list(fetched), [300])
+        self.assertEqual(fetched[300]["user_ids"], ["user1"])
+        self.assertEqual(self.messages_db.get_chats_by_ids([]), {})
+
     def test_get_chats_by_display_name(self):
         """Test getting chats by display name"""
         # Insert test chats
@@ -157,6 +186,20 @@ class TestChatsTable(unittest.TestCase):
         empty_chats = self.messages_db.get_chats_by_display_name("Non-existent")
         self.assertEqual(len(empty_chats), 0)
 
+    def test_get_chats_by_display_name_counts_messages_from_index(self):
+        """Test that message counts are read from a chat_messages index, not a table scan"""
+        with sqlite3.connect(self.db_path, uri=True) as conn:
+            plan = [
+                row[3] for row in conn.execute(
+                    "EXPLAIN QUERY PLAN " + CHATS_BY_DISPLAY_NAME_SQL, ("Message Count Test",)
+                )
+            ]
+
+        cm_steps = [step for step in plan if step.startswith(("SCAN cm", "SEARCH cm"))]
+        self.assertEqual(len(cm_steps), 1, plan)
+        self.assertIn("SEARCH cm USING COVERING INDEX", cm_steps[0])
+        self.assertIn("(chat_id=?)", cm_steps[0])
+
     def test_get_chats_by_display_name_ordered_by_message_count(self):
         """Test that chats with duplicate display names are ordered by message count (highest first)"""
         # Insert test chats with duplicate display names
@@ -168,47 +211,34 @@ class TestChatsTable(unittest.TestCase):
         self.messages_db.insert_chats_batch(chats)
 
         # Insert some test users and messages to create different message counts
-        from src.user.user import User
         users = [
             User("user1", "User", "One", "+1111111111", "user1@example.com", 1),
             User("user2", "User", "Two", "+2222222222", "user2@example.com", 2),
             User("user3", "User", "Three", "+3333333333", "user3@example.com", 3),
         ]
-        for user in users:
-            self.messages_db.insert_user(user)
-
-        # Insert messages for each chat to create different message counts
-        # Chat 250: 1 message
-        messages_250 = [{"message_id": "msg1", "user_id": "user1", "contents": "Hello", "is_from_me": 0, "created_at": 1000}]
-        self.messages_db.insert_messages_batch(messages_250)
-        chat_messages_250 = [{"chat_id": 250, "message_id": "msg1", "message_date": 1000}]
-        self.messages_db.insert_chat_messages_batch(chat_messages_250)
-
-        # Chat 251: 3 messages (highest count)
-        messages_251 = [
+        self.messages_db.insert_users_batch(users)
+
+        # Insert messages for each chat to create different message counts,
+        # one batch per table: chat 250 gets 1 message, chat 251 gets 3
+        # (highest count) and chat 252 gets 2
+        messages = [
+            {"message_id": "msg1", "user_id": "user1", "contents": "Hello", "is_from_me": 0, "created_at": 1000},
             {"message_id": "msg2", "user_id": "user2", "contents": "Hi", "is_from_me": 0, "created_at": 2000},
             {"message_id": "msg3", "user_id": "user2", "contents": "How are you?", "is_from_me": 0, "created_at": 3000},
             {"message_id": "msg4", "user_id": "user2", "contents": "Great!", "is_from_me": 1, "created_at": 4000},
+            {"message_id": "msg5", "user_id": "user3", "contents": "Test", "is_from_me": 0, "created_at": 5000},
+            {"message_id": "msg6", "user_id": "user3", "contents": "Message", "is_from_me": 1, "created_at": 6000},
         ]
-        self.messages_db.insert_messages_batch(messages_251)
-        chat_messages_251 = [
+        self.messages_db.insert_messages_batch(messages)
+        chat_messages = [
+            {"chat_id": 250, "message_id": "msg1", "message_date": 1000},
             {"chat_id": 251, "message_id": "msg2", "message_date": 2000},
             {"chat_id": 251, "message_id": "msg3", "message_date": 3000},
             {"chat_id": 251, "message_id": "msg4", "message_date": 4000},
-        ]
-        self.messages_db.insert_chat_messages_batch(chat_messages_251)
-
-        # Chat 252: 2 messages
-        messages_252 = [
-            {"message_id": "msg5", "user_id": "user3", "contents": "Test", "is_from_me": 0, "created_at": 5000},
-            {"message_id": "msg6", "user_id": "user3", "contents": "Message", "is_from_me": 1, "created_at": 6000},
-        ]
-        self.messages_db.insert_messages_batch(messages_252)
-        chat_messages_252 = [
             {"chat_id": 252, "message_id": "msg5", "message_date": 5000},
             {"chat_id": 252, "message_id": "msg6", "message_date": 6000},
         ]
-        self.messages_db.insert_chat_messages_batch(chat_messages_252)
+        self.messages_db.insert_chat_messages_batch(chat_messages)
 
         # Get chats by display name - should be ordered by message count (highest first)
         ordered_chats = self.messages_db.get_chats_by_display_name("Message Count Test")
@@ -282,7 +312,7 @@ class TestChatsTable(unittest.TestCase):
         self.messages_db.insert_chat(chat_id, display_name, user_ids)
 
         # Check raw database storage in chat_users table
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite3.connect(self.db_path, uri=True) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT user_id FROM chat_users WHERE chat_id = ? ORDER BY user_id",
@@ -314,94 +344,38 @@ class TestChatsTable(unittest.TestCase):
             self.assertIsNone(chat)
 
 
-class TestChatMigrationIntegration(unittest.TestCase):
-    """Integration tests for chat migration functionality"""
+class TestChatMigrationIntegration(MemoryDatabaseTestCase):
+    """Integration tests for chat migration functionality
 
-    def setUp(self):
-        """Set up test fixtures"""
-        # Create temporary databases
-        self.temp_source_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-        self.temp_source_db.close()
-        self.source_db_path = self.temp_source_db.name
+    The inherited template is the empty target; the mock Messages source gets
+    a template and per-test copy of its own.
+    """
 
-        self.temp_target_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-        self.temp_target_db.close()
-        self.target_db_path = self.temp_target_db.name
+    @classmethod
+    def setUpClass(cls):
+        """Build the mock source template alongside the empty target one"""
+        super().setUpClass()
+        # The template lives as long as this connection stays open
+        cls.source_template_conn = sqlite3.connect(memory_db_uri(f"{cls.__name__}_source"), uri=True)
+        cls.source_template_conn.executescript(MOCK_CHAT_SOURCE_SQL)
 
-        # Create source database with test data
-        self._create_source_database()
+    @classmethod
+    def tearDownClass(cls):
+        """Release the source template database"""
+        cls.source_template_conn.close()
+        super().tearDownClass()
 
-        # Create target database
-        self.messages_db = MessagesDatabase(self.target_db_path)
-        self.messages_db.create_database()
+    def setUp(self):
+        """Give each test its own copies of the source and target databases"""
+        super().setUp()
+        self.source_db_path, self.source_conn = copy_memory_db(
+            self.source_template_conn, f"{self.id()}_source"
+        )
 
     def tearDown(self):
         """Clean up test fixtures"""
-        Path(self.source_db_path).unlink(missing_ok=True)
-        Path(self.target_db_path).unlink(missing_ok=True)
-
-    def _create_source_database(self):
-        """Create a mock source database with chat and chat_handle_join tables"""
-        with sqlite3.connect(self.source_db_path) as conn:
-            cursor = conn.cursor()
-
-            # Create chat table
-            cursor.execute(
-                """
-                CREATE TABLE chat (
-                    ROWID INTEGER PRIMARY KEY,
-                    display_name TEXT,
-                    chat_identifier TEXT,
-                    service_name TEXT
-                )
-            """
-            )
-
-            # Create handle table
-            cursor.execute(
-                """
-                CREATE TABLE handle (
-                    ROWID INTEGER PRIMARY KEY,
-                    id TEXT NOT NULL,
-                    service TEXT NOT NULL
-                )
-            """
-            )
-
-            # Create chat_handle_join table
-            cursor.execute(
-                """
-                CREATE TABLE chat_handle_join (
-                    chat_id INTEGER,
-                    handle_id INTEGER
-                )
-            """
-            )
-
-            # Insert test data
-            # Chat 1: Quantabes
-            cursor.execute(
-                "INSERT INTO chat VALUES (1, 'Quantabes', '+12345678901', 'iMessage')"
-            )
-            cursor.execute(
-                "INSERT INTO handle VALUES (101, '+12345678901', 'iMessage')"
-            )
-            cursor.execute(
-                "INSERT INTO handle VALUES (102, '+12345678902', 'iMessage')"
-            )
-            cursor.execute("INSERT INTO chat_handle_join VALUES (1, 101)")
-            cursor.execute("INSERT INTO chat_handle_join VALUES (1, 102)")
-
-            # Chat 2: Test Group
-            cursor.execute(
-                "INSERT INTO chat VALUES (2, 'Test Group', 'chat123', 'iMessage')"
-            )
-            cursor.execute(
-                "INSERT INTO handle VALUES (103, '+12345678903', 'iMessage')"
-            )
-            cursor.execute("INSERT INTO chat_handle_join VALUES (2, 103)")
-
-            conn.commit()
+        self.source_conn.close()
+        super().tearDown()
 
     def _create_test_users(self):
         """Create test users in target database"""
@@ -411,8 +385,7 @@ class TestChatMigrationIntegration(unittest.TestCase):
             User("user3", "Test", "User", "+12345678903", "test@example.com", 103),
         ]
 
-        for user in test_users:
-            self.messages_db.insert_user(user)
+        self.messages_db.insert_users_batch(test_users)
 
     def test_chat_user_relationship_validation(self):
         """Test that chats maintain correct user relationships"""
@@ -458,13 +431,7 @@ class TestChatMigrationIntegration(unittest.TestCase):
             {"chat_id": 102, "display_name": "Test Group", "user_ids": ["user3"]},
         ]
         
-        for chat_data in test_chats:
-            result = self.messages_db.insert_chat(
-                chat_data["chat_id"], 
-                chat_data["display_name"], 
-                chat_data["user_ids"]
-            )
-            self.assertTrue(result)
+        self.assertEqual(self.messages_db.insert_chats_batch(test_chats), len(test_chats))
 
         # Verify statistics
         all_chats = self.messages_db.get_all_chats()
@@ -513,7 +480,8 @@ class TestChatMigrationIntegration(unittest.TestCase):
         self.assertTrue(result)
 
         # Use the existing validator to test data quality
-        validator = ChatMigrationValidator(self.source_db_path, self.target_db_path)
+        validator = ChatMigrationValidator(self.source_db_path, self.db_path)
+        self.addCleanup(validator.close)
 
         # Test Quantabes-specific validation (this validates the business logic)
         quantabes_valid = validator.validate_quantabes_chat()
@@ -29,4 +29,26 @@ def test_conversation_tables_exist(tmp_path):
             "conversation_id", "chat_id", "users", "created_at",
             "completed_at", "count", "summary", "status", "initiated_by"
         }
-        assert expected_columns.issubset(conv_columns)
\ No newline at end of file
+        assert expected_columns.issubset(conv_columns)
+
+def test_last_message_date_per_chat_uses_covering_index(tmp_path):
+    """Test per-chat last message dates come from a chat_messages index alone"""
+    db_path = tmp_path / "test.db"
+    assert MessagesDatabase(str(db_path)).create_database() is True
+
+    # chat_messages carries message_date, so listing chats by their latest
+    # message never needs the messages table
+    query = """
+        SELECT c.chat_id, c.display_name, MAX(cm.message_date) AS last_message_date
+        FROM chats c
+        JOIN chat_messages cm ON cm.chat_id = c.chat_id
+        GROUP BY c.chat_id
+        ORDER BY last_message_date DESC
+    """
+    with sqlite3.connect(str(db_path)) as conn:
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query)]
+
+    assert any(
+        "cm USING COVERING INDEX idx_chat_messages_chat_date" in step for step in plan
+    ), plan
+    assert not any("messages" in step.split() for step in plan), plan
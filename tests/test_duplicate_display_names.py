@@ -1,14 +1,9 @@
 #!/usr/bin/env python3
 """Test for duplicate display name handling with message count prioritization"""
 
-import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
-import sys
-
-# Add the src directory to the path so we can import our modules
-sys.path.append(str(Path(__file__).parent.parent))
 
 from src.database.messages_db import MessagesDatabase
 from src.user.user import User
@@ -47,26 +42,39 @@ def find_chat_by_display_name_with_db(db: MessagesDatabase, display_name: str) -
     
     return chat_id, user_id
 
+# Empties the tables these tests write to, junction tables first
+CLEAR_TABLES_SQL = """
+    DELETE FROM chat_messages;
+    DELETE FROM chat_users;
+    DELETE FROM messages;
+    DELETE FROM chats;
+    DELETE FROM users;
+"""
+
 
 class TestDuplicateDisplayNames(unittest.TestCase):
     """Test cases for handling duplicate display names by message count"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        # Create a temporary database for testing
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-        self.temp_db.close()
-        self.db_path = self.temp_db.name
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary database and its schema for the whole class"""
+        temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+        temp_db.close()
+        cls.db_path = temp_db.name
 
-        self.messages_db = MessagesDatabase(self.db_path)
+        cls.messages_db = MessagesDatabase(cls.db_path)
+        assert cls.messages_db.create_database()
 
-        # Create the database and tables
-        self.assertTrue(self.messages_db.create_database())
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary database file"""
+        cls.messages_db.close()
+        Path(cls.db_path).unlink(missing_ok=True)
 
-    def tearDown(self):
-        """Clean up test fixtures"""
-        # Remove the temporary database file
-        Path(self.db_path).unlink(missing_ok=True)
+    def setUp(self):
+        """Start each test from empty tables instead of a fresh schema"""
+        with self.messages_db._connect() as conn:
+            conn.executescript(CLEAR_TABLES_SQL)
 
     def test_find_chat_by_display_name_selects_most_messages(self):
         """Test that find_chat_by_display_name returns the chat with the most messages when duplicates exist"""
@@ -76,8 +84,7 @@ class TestDuplicateDisplayNames(unittest.TestCase):
             User("user2", "User", "Two", "+2222222222", "user2@example.com", 2),
             User("user3", "User", "Three", "+3333333333", "user3@example.com", 3),
         ]
-        for user in users:
-            self.messages_db.insert_user(user)
+        self.messages_db.insert_users_batch(users)
 
         # Insert test chats with the same display name
         chats = [
@@ -134,8 +141,7 @@ class TestDuplicateDisplayNames(unittest.TestCase):
             User("user1", "User", "One", "+1111111111", "user1@example.com", 1),
             User("user2", "User", "Two", "+2222222222", "user2@example.com", 2),
         ]
-        for user in users:
-            self.messages_db.insert_user(user)
+        self.messages_db.insert_users_batch(users)
 
         # Insert test chats with the same display name
         chats = [
@@ -11,7 +11,6 @@ that may not be available or appropriate in CI contexts.
 """
 
 import os
-import sys
 import unittest
 import tempfile
 import sqlite3
@@ -24,9 +23,6 @@ from unittest.mock import patch, MagicMock
 SKIP_INTEGRATION_TESTS = os.getenv('CI') == 'true' or os.getenv('CIRCLECI') == 'true'
 SKIP_REASON = "Integration tests skipped in CI environment"
 
-# Add src directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
 from src.database.smart_manager import SmartDatabaseManager
 from src.database.polling_service import MessagePollingService
 from scripts.validation.copy_freshness_checker import CopyFreshnessChecker
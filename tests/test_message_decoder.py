@@ -1,13 +1,13 @@
 """Comprehensive tests for message decoder"""
 
 import unittest
-import sys
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from src.messaging.decoder import MessageDecoder, extract_message_text
+from src.messaging.decoder import (
+    MessageDecoder,
+    extract_message_text,
+    extract_message_text_batch,
+)
 
 
 class TestMessageDecoder(unittest.TestCase):
@@ -49,6 +49,20 @@ class TestMessageDecoder(unittest.TestCase):
         result = extract_message_text(text, attributed_body)
         self.assertIsNone(result)
 
+    def test_extract_message_text_batch(self):
+        """Test batch extraction matches per-row extraction"""
+        attributed_body = b"\x04\x0bstreamtyped\x81\xe8\x03\x84\x01@\x84\x84\x84\x12NSAttributedString\x00\x84\x84\x08NSObject\x00\x85\x92\x84\x84\x84\x08NSString\x01\x94\x84\x01+\x05Test\x86\x84"
+        rows = [
+            ("Hello world", b"some binary data"),
+            (None, attributed_body),
+            ("", None),
+        ]
+
+        results = extract_message_text_batch(rows, decoder=self.decoder)
+
+        self.assertEqual(results, [extract_message_text(*row) for row in rows])
+        self.assertEqual(self.decoder.decode_success_count, 1)
+
     def test_decode_attributed_body_valid_format(self):
         """Test decoding valid NSKeyedArchiver format"""
         # Valid attributedBody with "Test message"
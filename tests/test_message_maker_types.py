@@ -158,6 +158,11 @@ class TestMessageResponse:
         reconstructed = MessageResponse.from_json(json_str)
         assert reconstructed == original
 
+    def test_message_response_is_slotted(self):
+        """Test instances use __slots__ rather than a per-instance __dict__."""
+        response = MessageResponse(response_1="A", response_2="B", response_3="C")
+        assert not hasattr(response, "__dict__")
+
 
 class TestChatMessage:
     """Test cases for ChatMessage data class."""
@@ -205,6 +210,16 @@ class TestChatMessage:
         with pytest.raises(ValueError, match="created_at must be a valid ISO8601 timestamp"):
             message.validate()
 
+    def test_chat_message_is_slotted(self):
+        """Test instances use __slots__ rather than a per-instance __dict__."""
+        message = ChatMessage(contents="Hi", is_from_me=False, created_at="2023-01-01T10:00:00Z")
+        assert not hasattr(message, "__dict__")
+        assert message.to_dict() == {
+            "contents": "Hi",
+            "is_from_me": False,
+            "created_at": "2023-01-01T10:00:00Z",
+        }
+
     def test_chat_message_validation_various_timestamp_formats(self):
         """Test validation with various valid timestamp formats."""
         valid_timestamps = [
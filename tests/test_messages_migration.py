@@ -6,40 +6,156 @@ Tests the complete migration process from source Messages database
 to the new messages table with text decoding.
 """
 
+import math
+import os
+import shutil
 import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any
+from unittest.mock import patch
 
-import sys
+from scripts.migration import migrate_messages_table
+from scripts.migration.migrate_messages_table import MessagesTableMigrator
+from src.database.messages_db import MessageRow, MessagesDatabase
+from src.messaging.decoder import extract_message_text
+from src.user.user import User
+
+
+# Mock Messages app database: schema, chat.db-style indexes and seed data,
+# built in one script. Dates are 2023-12-01 12:00:00 (723124800 in macOS
+# epoch seconds) plus one minute per message.
+MOCK_SOURCE_DATABASE_SQL = """
+    -- Throwaway database: skip journaling and fsyncs
+    PRAGMA journal_mode = MEMORY;
+    PRAGMA synchronous = OFF;
+    PRAGMA temp_store = MEMORY;
+
+    BEGIN;
+
+    CREATE TABLE handle (
+        ROWID INTEGER PRIMARY KEY,
+        id TEXT UNIQUE,
+        country TEXT,
+        service TEXT
+    );
+
+    CREATE TABLE message (
+        ROWID INTEGER PRIMARY KEY,
+        guid TEXT UNIQUE,
+        text TEXT,
+        attributedBody BLOB,
+        handle_id INTEGER,
+        is_from_me INTEGER,
+        date INTEGER,
+        service TEXT,
+        FOREIGN KEY (handle_id) REFERENCES handle (ROWID)
+    );
+
+    CREATE TABLE chat (
+        ROWID INTEGER PRIMARY KEY,
+        guid TEXT UNIQUE,
+        display_name TEXT,
+        chat_identifier TEXT,
+        service_name TEXT
+    );
+
+    CREATE TABLE chat_message_join (
+        chat_id INTEGER,
+        message_id INTEGER,
+        message_date INTEGER,
+        PRIMARY KEY (chat_id, message_id),
+        FOREIGN KEY (chat_id) REFERENCES chat (ROWID),
+        FOREIGN KEY (message_id) REFERENCES message (ROWID)
+    );
+
+    -- Indexes mirroring those in the real chat.db used by the migrator
+    CREATE INDEX message_idx_handle ON message(handle_id);
+    CREATE INDEX message_idx_date ON message(date);
+    CREATE INDEX chat_message_join_idx_message_id_only ON chat_message_join(message_id);
+
+    INSERT INTO handle (ROWID, id, country, service) VALUES
+        (1, '+15551234567', 'US', 'iMessage'),
+        (2, 'test@example.com', NULL, 'iMessage'),
+        (3, '+15559876543', 'US', 'SMS');
+
+    INSERT INTO message (ROWID, guid, text, attributedBody, handle_id, is_from_me, date, service) VALUES
+        (1, 'msg-001', 'Hello, how are you?', NULL, 1, 0, 723124800, 'iMessage'),
+        (2, 'msg-002', 'I''m doing well, thanks!', NULL, NULL, 1, 723124860, 'iMessage'),
+        (3, 'msg-003', NULL, X'62696e6172795f617474726962757465645f626f64795f64617461', 2, 0, 723124920, 'iMessage'),
+        (4, 'msg-004', 'Meeting at 3pm 📅', NULL, 1, 0, 723124980, 'iMessage'),
+        (5, 'msg-005', '', NULL, 3, 1, 723125040, 'SMS'),  -- Empty text
+        (6, 'msg-006', 'Long message content that should be preserved during migration and testing', NULL, 2, 0, 723125100, 'iMessage'),
+        -- attributedBody only, in the streamtyped format chat.db uses
+        (7, 'msg-007', NULL, X'040b73747265616d747970656481e803840140848484124e5341747472696275746564537472696e67008484084e534f626a656374008592848484084e53537472696e67019484012b0c54657374206d6573736167658684', 3, 0, 723125160, 'SMS');
+
+    INSERT INTO chat (ROWID, guid, display_name, chat_identifier, service_name) VALUES
+        (1, 'chat-001', 'Test Chat', 'chat001', 'iMessage');
+
+    INSERT INTO chat_message_join (chat_id, message_id, message_date) VALUES
+        (1, 1, 723124800),
+        (1, 2, 723124860),
+        (1, 3, 723124920),
+        (1, 4, 723124980),
+        (1, 5, 723125040),
+        (1, 6, 723125100),
+        (1, 7, 723125160);
+
+    COMMIT;
+"""
 
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent.parent / "src"))
+MESSAGE_INSERT_SQL = (
+    "INSERT INTO message (ROWID, guid, text, attributedBody, handle_id, is_from_me, date, service) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
 
-from scripts.migration.migrate_messages_table import MessagesTableMigrator
-from database.messages_db import MessagesDatabase
-from messaging.decoder import extract_message_text
+DELETE_MESSAGES_WITHOUT_TEXT_SQL = "DELETE FROM message WHERE text IS NULL OR text = ''"
+
+# Rows that the migrator must tolerate: no content at all, and a handle_id
+# with no matching handle
+CORRUPTED_MESSAGES = (
+    (100, "corrupt-msg", None, None, 1, 0, 1701432000, "iMessage"),
+    (101, "invalid-handle-msg", "Valid text", None, 999, 0, 1701432000, "iMessage"),
+)
 
 
 class TestMessagesMigration(unittest.TestCase):
     """Integration tests for messages table migration"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the mock source database once and reuse it as a template"""
+        fd, cls._template_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        cls.create_mock_source_database(cls._template_path)
+        cls._extracted_messages = None
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the template source database"""
+        Path(cls._template_path).unlink(missing_ok=True)
+
+    def _cached_messages(self):
+        """Extract messages from the unmodified mock source once per class
+
+        Only for tests that do not alter their source database copy.
+        """
+        cls = type(self)
+        if cls._extracted_messages is None:
+            cls._extracted_messages = self.migrator.extract_messages_with_text()
+        return cls._extracted_messages
+
     def setUp(self):
         """Set up test databases for each test"""
-        # Create temporary source database
-        self.temp_source_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-        self.temp_source_db.close()
-        self.source_db_path = self.temp_source_db.name
-
-        # Create temporary target database
-        self.temp_target_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-        self.temp_target_db.close()
-        self.target_db_path = self.temp_target_db.name
+        # Keep both databases (and any journal files) in one temporary directory
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source_db_path = str(Path(self.temp_dir.name) / "source.db")
+        self.target_db_path = str(Path(self.temp_dir.name) / "target.db")
 
-        # Create mock source database with Messages app schema
-        self.create_mock_source_database()
+        # Copy the mock source database so tests can mutate it freely
+        shutil.copyfile(self._template_path, self.source_db_path)
 
         # Initialize migrator
         self.migrator = MessagesTableMigrator(
@@ -49,114 +165,14 @@ class TestMessagesMigration(unittest.TestCase):
 
     def tearDown(self):
         """Clean up after each test"""
-        Path(self.source_db_path).unlink(missing_ok=True)
-        Path(self.target_db_path).unlink(missing_ok=True)
+        self.temp_dir.cleanup()
 
-    def create_mock_source_database(self):
+    @staticmethod
+    def create_mock_source_database(db_path):
         """Create a mock source database with Messages app schema and test data"""
-        with sqlite3.connect(self.source_db_path) as conn:
-            cursor = conn.cursor()
-
-            # Create handle table
-            cursor.execute("""
-                CREATE TABLE handle (
-                    ROWID INTEGER PRIMARY KEY,
-                    id TEXT UNIQUE,
-                    country TEXT,
-                    service TEXT
-                )
-            """)
-
-            # Create message table  
-            cursor.execute("""
-                CREATE TABLE message (
-                    ROWID INTEGER PRIMARY KEY,
-                    guid TEXT UNIQUE,
-                    text TEXT,
-                    attributedBody BLOB,
-                    handle_id INTEGER,
-                    is_from_me INTEGER,
-                    date INTEGER,
-                    service TEXT,
-                    FOREIGN KEY (handle_id) REFERENCES handle (ROWID)
-                )
-            """)
-
-            # Create chat table
-            cursor.execute("""
-                CREATE TABLE chat (
-                    ROWID INTEGER PRIMARY KEY,
-                    guid TEXT UNIQUE,
-                    display_name TEXT,
-                    chat_identifier TEXT,
-                    service_name TEXT
-                )
-            """)
-
-            # Create chat_message_join table
-            cursor.execute("""
-                CREATE TABLE chat_message_join (
-                    chat_id INTEGER,
-                    message_id INTEGER,
-                    message_date INTEGER,
-                    PRIMARY KEY (chat_id, message_id),
-                    FOREIGN KEY (chat_id) REFERENCES chat (ROWID),
-                    FOREIGN KEY (message_id) REFERENCES message (ROWID)
-                )
-            """)
-
-            # Insert test handles
-            test_handles = [
-                (1, "+15551234567", "US", "iMessage"),
-                (2, "test@example.com", None, "iMessage"),
-                (3, "+15559876543", "US", "SMS"),
-            ]
-            
-            cursor.executemany(
-                "INSERT INTO handle (ROWID, id, country, service) VALUES (?, ?, ?, ?)",
-                test_handles
-            )
-
-            # Insert test messages
-            # Using Unix timestamp offset for macOS date format
-            base_date = 1701432000 - 978307200  # 2023-12-01 12:00:00 in macOS format
-            
-            test_messages = [
-                (1, "msg-001", "Hello, how are you?", None, 1, 0, base_date, "iMessage"),
-                (2, "msg-002", "I'm doing well, thanks!", None, None, 1, base_date + 60, "iMessage"),
-                (3, "msg-003", None, b"binary_attributed_body_data", 2, 0, base_date + 120, "iMessage"),
-                (4, "msg-004", "Meeting at 3pm 📅", None, 1, 0, base_date + 180, "iMessage"),
-                (5, "msg-005", "", None, 3, 1, base_date + 240, "SMS"),  # Empty text
-                (6, "msg-006", "Long message content that should be preserved during migration and testing", None, 2, 0, base_date + 300, "iMessage"),
-            ]
-            
-            cursor.executemany(
-                "INSERT INTO message (ROWID, guid, text, attributedBody, handle_id, is_from_me, date, service) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                test_messages
-            )
-
-            # Insert test chat
-            cursor.execute(
-                "INSERT INTO chat (ROWID, guid, display_name, chat_identifier, service_name) VALUES (?, ?, ?, ?, ?)",
-                (1, "chat-001", "Test Chat", "chat001", "iMessage")
-            )
-
-            # Link messages to chat
-            chat_message_links = [
-                (1, 1, base_date),
-                (1, 2, base_date + 60),
-                (1, 3, base_date + 120),
-                (1, 4, base_date + 180),
-                (1, 5, base_date + 240),
-                (1, 6, base_date + 300),
-            ]
-            
-            cursor.executemany(
-                "INSERT INTO chat_message_join (chat_id, message_id, message_date) VALUES (?, ?, ?)",
-                chat_message_links
-            )
-
-            conn.commit()
+        # Autocommit mode so the script's BEGIN/COMMIT delimit the transaction
+        with sqlite3.connect(db_path, isolation_level=None) as conn:
+            conn.executescript(MOCK_SOURCE_DATABASE_SQL)
 
     def test_source_database_validation(self):
         """Test validation of source database structure"""
@@ -173,28 +189,27 @@ class TestMessagesMigration(unittest.TestCase):
 
     def test_extract_messages_with_text(self):
         """Test extraction of messages with decoded text"""
-        messages = self.migrator.extract_messages_with_text()
+        messages = self._cached_messages()
         
         # Should extract messages with text content (excluding empty ones)
         self.assertGreater(len(messages), 0)
         
         # Check message structure
         for message in messages:
-            self.assertIn("message_id", message)
-            self.assertIn("user_id", message)
-            self.assertIn("contents", message)
-            self.assertIn("is_from_me", message)
-            self.assertIn("created_at", message)
-            
+            self.assertIsInstance(message, MessageRow)
+
             # Verify data types
-            self.assertIsInstance(message["message_id"], int)
-            self.assertIsInstance(message["user_id"], str)
-            self.assertIsInstance(message["contents"], str)
-            self.assertIsInstance(message["is_from_me"], bool)
-            self.assertIsInstance(message["created_at"], str)
-            
+            self.assertIsInstance(message.message_id, int)
+            self.assertIsInstance(message.user_id, str)
+            self.assertIsInstance(message.contents, str)
+            self.assertIsInstance(message.is_from_me, bool)
+            self.assertIsInstance(message.created_at, str)
+
+            # Dictionary-style access still works during the transition
+            self.assertEqual(message["contents"], message.contents)
+
             # Contents should not be empty after processing
-            self.assertNotEqual(message["contents"].strip(), "")
+            self.assertNotEqual(message.contents.strip(), "")
 
     def test_extract_messages_with_limit(self):
         """Test extraction with message limit"""
@@ -203,30 +218,58 @@ class TestMessagesMigration(unittest.TestCase):
         self.assertLessEqual(len(limited_messages), 3)
         
         # Extract without limit  
-        all_messages = self.migrator.extract_messages_with_text()
+        all_messages = self._cached_messages()
         self.assertGreaterEqual(len(all_messages), len(limited_messages))
 
+    def test_extract_columns(self):
+        """Test column-oriented extraction matches the row extraction"""
+        columns = self.migrator.extract_columns()
+        messages = self._cached_messages()
+
+        self.assertEqual(list(columns), list(MessageRow._fields))
+        self.assertEqual(columns["contents"], [msg.contents for msg in messages])
+        self.assertEqual(columns["message_id"], [msg.message_id for msg in messages])
+
     def test_text_decoding_integration(self):
         """Test that text decoding is properly integrated"""
-        messages = self.migrator.extract_messages_with_text()
+        messages = self._cached_messages()
+        by_contents = {msg.contents: msg for msg in messages}
         
         # Find message with regular text
-        text_message = next((msg for msg in messages if "Hello, how are you?" in msg["contents"]), None)
-        self.assertIsNotNone(text_message)
-        self.assertEqual(text_message["contents"], "Hello, how are you?")
+        self.assertIn("Hello, how are you?", by_contents)
         
         # Find message with emoji
-        emoji_message = next((msg for msg in messages if "📅" in msg["contents"]), None)
-        self.assertIsNotNone(emoji_message)
-        self.assertIn("Meeting at 3pm 📅", emoji_message["contents"])
-
+        self.assertIn("Meeting at 3pm 📅", by_contents)
+
+        # Find message decoded from attributedBody only
+        self.assertIn("Test message", by_contents)
+
+    def test_attributed_body_decoded_only_without_text(self):
+        """Test the decoder only runs for rows that have no plain text"""
+        with patch.object(
+            migrate_messages_table,
+            "extract_message_text",
+            wraps=migrate_messages_table.extract_message_text,
+        ) as extract:
+            messages = self.migrator.extract_messages_with_text()
+
+        # Only msg-003 and msg-007 lack text; the empty-text row is
+        # filtered out in SQL and never reaches Python
+        self.assertEqual(extract.call_count, 2)
+        for text, attributed_body in (c.args for c in extract.call_args_list):
+            self.assertIsNone(text)
+            self.assertIsNotNone(attributed_body)
+
+        contents = {msg.contents for msg in messages}
+        self.assertIn("Hello, how are you?", contents)
+        self.assertIn("Test message", contents)
 
     def test_timestamp_conversion(self):
         """Test proper conversion of macOS timestamps to ISO format"""
-        messages = self.migrator.extract_messages_with_text()
+        messages = self._cached_messages()
         
         for message in messages:
-            created_at = message["created_at"]
+            created_at = message.created_at
             
             # Should be valid ISO format timestamp
             try:
@@ -243,13 +286,13 @@ class TestMessagesMigration(unittest.TestCase):
         
         # Verify target database has messages
         messages_db = MessagesDatabase(self.target_db_path)
-        migrated_messages = messages_db.get_all_messages()
+        migrated_count = messages_db.count_messages()
         
-        self.assertGreater(len(migrated_messages), 0)
-        self.assertLessEqual(len(migrated_messages), 5)  # Respects limit
+        self.assertGreater(migrated_count, 0)
+        self.assertLessEqual(migrated_count, 5)  # Respects limit
         
         # Verify message structure in target database
-        for message in migrated_messages:
+        for message in messages_db.get_all_messages(limit=5):
             self.assertIn("message_id", message)
             self.assertIn("user_id", message)
             self.assertIn("contents", message)
@@ -258,13 +301,94 @@ class TestMessagesMigration(unittest.TestCase):
 
     def test_migration_batch_processing(self):
         """Test migration with different batch sizes"""
-        # Test with small batch size
-        success = self.migrator.migrate_messages(batch_size=2)
+        total = len(self._cached_messages())
+        messages_db = self.migrator.messages_db
+
+        # Test with small batch size; a limit routes every row through
+        # the Python batches rather than the SQL fast path
+        with patch.object(
+            messages_db,
+            "insert_messages_batch",
+            wraps=messages_db.insert_messages_batch,
+        ) as mock_insert:
+            success = self.migrator.migrate_messages(batch_size=2, limit=total)
         self.assertTrue(success)
-        
-        messages_db = MessagesDatabase(self.target_db_path)
-        migrated_messages = messages_db.get_all_messages()
-        self.assertGreater(len(migrated_messages), 0)
+
+        # One batched insert per batch, never more than batch_size rows each
+        self.assertEqual(mock_insert.call_count, math.ceil(total / 2))
+        for call in mock_insert.call_args_list:
+            self.assertLessEqual(len(call.args[0]), 2)
+
+        self.assertGreater(messages_db.count_messages(), 0)
+
+    def test_sql_fast_path_matches_python_path(self):
+        """Test the attached-database copy produces the same rows as Python"""
+        messages_db = self.migrator.messages_db
+        columns = ("message_id", "user_id", "contents", "is_from_me", "created_at")
+
+        def migrated_rows():
+            return sorted(
+                tuple(msg[column] for column in columns)
+                for msg in messages_db.get_all_messages()
+            )
+
+        # A user matched by handle_id, so both paths map user_id
+        messages_db.create_database()
+        messages_db.insert_user(
+            User(
+                user_id="user-1",
+                first_name="Test",
+                last_name="User",
+                phone_number="+15551234567",
+                email="",
+                handle_id=1,
+            )
+        )
+
+        # Unlimited migration uses the SQL fast path for text messages
+        self.assertTrue(self.migrator.migrate_messages())
+        fast_rows = migrated_rows()
+        self.assertIn("user-1", {row[1] for row in fast_rows})
+
+        # A limit covering every row forces the all-Python path
+        self.assertTrue(self.migrator.migrate_messages(limit=1000))
+        self.assertEqual(fast_rows, migrated_rows())
+
+    def test_sql_fast_path_failure_detaches_source(self):
+        """Test a failed SQL copy raises its own error and leaves src detached"""
+        self.migrator.messages_db.create_database()
+
+        with patch.object(
+            migrate_messages_table,
+            "_mac_timestamp_to_iso",
+            side_effect=ValueError("bad timestamp"),
+        ):
+            with self.assertRaises(sqlite3.OperationalError) as context:
+                self.migrator._migrate_text_messages_in_sql()
+
+        # The INSERT's error, not DETACH failing on a locked database
+        self.assertIn("user-defined function raised exception", str(context.exception))
+
+        # The connection is reused, so a later ATTACH ... AS src must work
+        conn = self.migrator.messages_db._connect()
+        attached = [row[1] for row in conn.execute("PRAGMA database_list")]
+        self.assertNotIn("src", attached)
+        self.assertGreater(self.migrator._migrate_text_messages_in_sql(), 0)
+
+    def test_text_only_source_skips_python_decoding(self):
+        """Test no message is decoded in Python when every row has text"""
+        with sqlite3.connect(self.source_db_path) as conn:
+            conn.execute(DELETE_MESSAGES_WITHOUT_TEXT_SQL)
+
+        with patch.object(
+            migrate_messages_table,
+            "extract_message_text",
+            wraps=migrate_messages_table.extract_message_text,
+        ) as extract:
+            self.assertTrue(self.migrator.migrate_messages())
+
+        self.assertEqual(extract.call_count, 0)
+        self.assertEqual(self.migrator.messages_db.count_messages(), 4)
 
     def test_migration_stats(self):
         """Test migration statistics functionality"""
@@ -278,7 +402,29 @@ class TestMessagesMigration(unittest.TestCase):
         
         # Get post-migration stats
         post_stats = self.migrator.get_migration_stats()
-        self.assertGreater(post_stats["target_stats"]["total_messages"], 0)
+        self.assertIs(post_stats["target_stats"]["has_messages"], True)
+        self.assertNotIn("total_messages", post_stats["target_stats"])
+
+        # Exact counts are opt-in
+        counted_stats = self.migrator.get_migration_stats(count_target_messages=True)
+        self.assertGreater(counted_stats["target_stats"]["total_messages"], 0)
+
+    def test_target_db_pragmas(self):
+        """Test the target database is written in WAL mode with mmap and synchronous=NORMAL"""
+        self.assertTrue(self.migrator.migrate_messages())
+
+        # journal_mode persists in the file, so any connection sees it
+        with sqlite3.connect(self.target_db_path) as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(journal_mode, "wal")
+
+        # mmap_size and synchronous are per connection, so check the
+        # database's own connections
+        with self.migrator.messages_db._connect() as conn:
+            mmap_size = conn.execute("PRAGMA mmap_size").fetchone()[0]
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        self.assertGreater(mmap_size, 0)
+        self.assertEqual(synchronous, 1)  # NORMAL
 
     def test_migration_idempotency(self):
         """Test that running migration multiple times doesn't duplicate data"""
@@ -287,13 +433,13 @@ class TestMessagesMigration(unittest.TestCase):
         self.assertTrue(success1)
         
         messages_db = MessagesDatabase(self.target_db_path)
-        first_count = len(messages_db.get_all_messages())
+        first_count = messages_db.count_messages()
         
         # Run migration second time (should clear and re-migrate)
         success2 = self.migrator.migrate_messages(limit=3)
         self.assertTrue(success2)
         
-        second_count = len(messages_db.get_all_messages())
+        second_count = messages_db.count_messages()
         
         # Should have same count (not duplicated)
         self.assertEqual(first_count, second_count)
@@ -302,21 +448,7 @@ class TestMessagesMigration(unittest.TestCase):
         """Test migration handling of corrupted or invalid data"""
         # Add some corrupted data to source database
         with sqlite3.connect(self.source_db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Insert message with NULL text and attributedBody (should be filtered out)
-            cursor.execute(
-                "INSERT INTO message (ROWID, guid, text, attributedBody, handle_id, is_from_me, date, service) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                (100, "corrupt-msg", None, None, 1, 0, 1701432000, "iMessage")
-            )
-            
-            # Insert message with invalid handle_id
-            cursor.execute(
-                "INSERT INTO message (ROWID, guid, text, attributedBody, handle_id, is_from_me, date, service) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                (101, "invalid-handle-msg", "Valid text", None, 999, 0, 1701432000, "iMessage")
-            )
-            
-            conn.commit()
+            conn.executemany(MESSAGE_INSERT_SQL, CORRUPTED_MESSAGES)
         
         # Migration should still succeed
         success = self.migrator.migrate_messages()
@@ -324,8 +456,21 @@ class TestMessagesMigration(unittest.TestCase):
         
         # Should have extracted valid messages
         messages_db = MessagesDatabase(self.target_db_path)
-        migrated_messages = messages_db.get_all_messages()
-        self.assertGreater(len(migrated_messages), 0)
+        self.assertGreater(messages_db.count_messages(), 0)
+
+    def test_main_runs_without_prompting(self):
+        """Test the CLI migrates a smoke-test slice by default and all with --full"""
+        with patch.object(migrate_messages_table, "MessagesTableMigrator") as migrator_class:
+            migrator = migrator_class.return_value
+            migrator.migrate_messages.return_value = True
+
+            self.assertEqual(migrate_messages_table.main([]), 0)
+            migrator.migrate_messages.assert_called_with(
+                batch_size=500, limit=migrate_messages_table.SMOKE_TEST_LIMIT
+            )
+
+            self.assertEqual(migrate_messages_table.main(["--full"]), 0)
+            migrator.migrate_messages.assert_called_with(batch_size=500, limit=None)
 
 
 if __name__ == "__main__":
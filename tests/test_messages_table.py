@@ -7,39 +7,19 @@ with the existing database structure.
 """
 
 import sqlite3
-import tempfile
 import unittest
-from pathlib import Path
 from typing import List, Dict, Any
 
-import sys
+from src.database.messages_db import MessageRow, MessagesDatabase
+from tests.memory_db import MemoryDatabaseTestCase
 
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from database.messages_db import MessagesDatabase
-
-
-class TestMessagesTable(unittest.TestCase):
+class TestMessagesTable(MemoryDatabaseTestCase):
     """Test cases for the new messages table functionality"""
 
-    def setUp(self):
-        """Set up test database for each test"""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-        self.temp_db.close()
-        self.db_path = self.temp_db.name
-        self.messages_db = MessagesDatabase(self.db_path)
-        
-        # Create the database with all tables
-        self.assertTrue(self.messages_db.create_database())
-
-    def tearDown(self):
-        """Clean up after each test"""
-        Path(self.db_path).unlink(missing_ok=True)
-
     def test_messages_table_creation(self):
         """Test that the messages table is created with correct schema"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite3.connect(self.db_path, uri=True) as conn:
             cursor = conn.cursor()
             
             # Check table exists
@@ -71,7 +51,7 @@ class TestMessagesTable(unittest.TestCase):
 
     def test_messages_table_indexes(self):
         """Test that proper indexes are created for the messages table"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite3.connect(self.db_path, uri=True) as conn:
             cursor = conn.cursor()
             
             # Get all indexes for messages table
@@ -147,8 +127,46 @@ class TestMessagesTable(unittest.TestCase):
         self.assertEqual(inserted_count, 10)
         
         # Verify all messages were inserted
-        all_messages = self.messages_db.get_all_messages()
-        self.assertEqual(len(all_messages), 10)
+        self.assertEqual(self.messages_db.count_messages(), 10)
+
+    def test_insert_messages_batch_with_message_rows(self):
+        """Test batch insertion of MessageRow tuples"""
+        messages = [
+            MessageRow(1, "user_a", "First", True, "2023-12-01T10:00:00"),
+            MessageRow(2, "user_b", "Second", False, "2023-12-01T10:01:00"),
+        ]
+
+        inserted_count = self.messages_db.insert_messages_batch(messages)
+        self.assertEqual(inserted_count, 2)
+
+        retrieved = self.messages_db.get_message_by_id(2)
+        self.assertEqual(retrieved["contents"], messages[1]["contents"])
+        self.assertEqual(retrieved["user_id"], messages[1].user_id)
+
+    def test_bulk_load(self):
+        """Test loading several tables in one transaction"""
+        success = self.messages_db.bulk_load(
+            users=[("user_a", "Ann", "Lee", "+15550000001", "ann@example.com", 1)],
+            chats=[(10, "Chat A")],
+            chat_users=[(10, "user_a")],
+            messages=[MessageRow(1, "user_a", "Hi", True, "2023-12-01T10:00:00")],
+            chat_messages=[(10, 1, "2023-12-01T10:00:00")],
+        )
+        self.assertTrue(success)
+
+        self.assertEqual(self.messages_db.count_messages(), 1)
+        self.assertEqual(self.messages_db.get_chat_by_id(10)["user_ids"], ["user_a"])
+        self.assertEqual(len(self.messages_db.get_messages_in_chat(10)), 1)
+
+    def test_bulk_load_rolls_back_on_error(self):
+        """Test that a failing table leaves every table untouched"""
+        success = self.messages_db.bulk_load(
+            messages=[MessageRow(1, "user_a", "Hi", True, "2023-12-01T10:00:00")],
+            # Duplicate primary key fails after messages were written
+            chat_messages=[(10, 1, "2023-12-01T10:00:00"), (10, 1, "2023-12-01T10:00:00")],
+        )
+        self.assertFalse(success)
+        self.assertEqual(self.messages_db.count_messages(), 0)
 
     def test_get_message_by_id(self):
         """Test retrieving a message by its ID"""
@@ -175,14 +193,13 @@ class TestMessagesTable(unittest.TestCase):
         """Test retrieving messages for a specific user"""
         # Insert messages for different users
         messages = [
-            {"message_id": 1, "user_id": "user_a", "contents": "Message 1", "is_from_me": True, "created_at": "2023-12-01T10:00:00"},
-            {"message_id": 2, "user_id": "user_a", "contents": "Message 2", "is_from_me": False, "created_at": "2023-12-01T10:01:00"},
-            {"message_id": 3, "user_id": "user_b", "contents": "Message 3", "is_from_me": True, "created_at": "2023-12-01T10:02:00"},
-            {"message_id": 4, "user_id": "user_a", "contents": "Message 4", "is_from_me": True, "created_at": "2023-12-01T10:03:00"},
+            MessageRow(1, "user_a", "Message 1", True, "2023-12-01T10:00:00"),
+            MessageRow(2, "user_a", "Message 2", False, "2023-12-01T10:01:00"),
+            MessageRow(3, "user_b", "Message 3", True, "2023-12-01T10:02:00"),
+            MessageRow(4, "user_a", "Message 4", True, "2023-12-01T10:03:00"),
         ]
         
-        for msg in messages:
-            self.messages_db.insert_message(**msg)
+        self.assertEqual(self.messages_db.insert_messages_batch(messages), len(messages))
         
         # Get messages for user_a
         user_a_messages = self.messages_db.get_messages_by_user("user_a")
@@ -202,13 +219,11 @@ class TestMessagesTable(unittest.TestCase):
         """Test retrieving all messages"""
         # Insert test messages
         messages = [
-            {"message_id": i + 1, "user_id": "user_1", "contents": f"Content {i}", 
-             "is_from_me": True, "created_at": f"2023-12-01T10:0{i}:00"}
+            MessageRow(i + 1, "user_1", f"Content {i}", True, f"2023-12-01T10:0{i}:00")
             for i in range(5)
         ]
         
-        for msg in messages:
-            self.messages_db.insert_message(**msg)
+        self.assertEqual(self.messages_db.insert_messages_batch(messages), len(messages))
         
         # Get all messages
         all_messages = self.messages_db.get_all_messages()
@@ -222,23 +237,21 @@ class TestMessagesTable(unittest.TestCase):
         """Test clearing all messages from the table"""
         # Insert test messages
         messages = [
-            {"message_id": i + 1, "user_id": "user_1", "contents": f"Content {i}",
-             "is_from_me": True, "created_at": f"2023-12-01T10:0{i}:00"}
+            MessageRow(i + 1, "user_1", f"Content {i}", True, f"2023-12-01T10:0{i}:00")
             for i in range(3)
         ]
         
-        for msg in messages:
-            self.messages_db.insert_message(**msg)
+        self.assertEqual(self.messages_db.insert_messages_batch(messages), len(messages))
         
         # Verify messages exist
-        self.assertEqual(len(self.messages_db.get_all_messages()), 3)
+        self.assertEqual(self.messages_db.count_messages(), 3)
         
         # Clear table
         success = self.messages_db.clear_messages_table()
         self.assertTrue(success)
         
         # Verify table is empty
-        self.assertEqual(len(self.messages_db.get_all_messages()), 0)
+        self.assertEqual(self.messages_db.count_messages(), 0)
 
     def test_boolean_handling(self):
         """Test proper handling of boolean values for is_from_me"""
@@ -48,13 +48,12 @@ class TestMessageResult:
 class TestMessageService:
     """Test the MessageService class."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.config = MessageConfig(
-            max_message_length=100,
-            require_imessage_enabled=False,
-            validate_recipients=True
-        )
+    # Shared by every test; MessageService never mutates its config
+    config = MessageConfig(
+        max_message_length=100,
+        require_imessage_enabled=False,
+        validate_recipients=True
+    )
     
     @patch('src.messaging.service.AppleScriptMessageService')
     def test_service_creation(self, mock_applescript):
@@ -3,11 +3,8 @@
 import unittest
 import sqlite3
 from pathlib import Path
-import sys
 
-# Add src to path for imports
-sys.path.append('../src')
-from messaging.decoder import MessageDecoder
+from src.messaging.decoder import MessageDecoder
 
 
 class TestNSDictionaryDecoder(unittest.TestCase):
@@ -5,9 +5,7 @@ import sys
 import sqlite3
 from pathlib import Path
 
-# Add src to path for imports
-sys.path.append('./src')
-from messaging.decoder import MessageDecoder
+from src.messaging.decoder import MessageDecoder
 
 
 def test_target_message():
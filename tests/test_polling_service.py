@@ -6,7 +6,7 @@ import tempfile
 import unittest
 from datetime import datetime
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import DEFAULT, Mock, patch, MagicMock
 
 from src.database.polling_service import MessagePollingService
 from src.database.messages_db import MessagesDatabase
@@ -40,6 +40,8 @@ class TestMessagePollingService(unittest.TestCase):
     def tearDown(self):
         """Clean up test environment"""
         import shutil
+        self.polling_service.close()
+        self.messages_db.close()
         shutil.rmtree(self.test_dir, ignore_errors=True)
     
     def _create_mock_source_database(self):
@@ -154,16 +156,15 @@ class TestMessagePollingService(unittest.TestCase):
         # Should get fewer messages when starting from later ROWID
         self.assertLessEqual(len(later_messages), initial_count)
     
-    @patch('src.database.polling_service.extract_message_text')
-    @patch('src.database.polling_service.DatabaseManager')
-    def test_get_new_messages_text_extraction(self, mock_db_manager, mock_extract_text):
+    @patch.multiple('src.database.polling_service', DatabaseManager=DEFAULT, extract_message_text=DEFAULT)
+    def test_get_new_messages_text_extraction(self, DatabaseManager, extract_message_text):
         """Test text extraction in get_new_messages_from_source"""
         # Mock dependencies
         mock_manager = Mock()
         mock_manager.create_safe_copy.return_value = Path(self.source_db_path)
-        mock_db_manager.return_value = mock_manager
+        DatabaseManager.return_value = mock_manager
         
-        mock_extract_text.side_effect = lambda text, blob: text or "extracted_text"
+        extract_message_text.side_effect = lambda text, blob: text or "extracted_text"
         
         # Create polling service AFTER the patch is applied
         polling_service = MessagePollingService(
@@ -175,7 +176,7 @@ class TestMessagePollingService(unittest.TestCase):
         new_messages = polling_service.get_new_messages_from_source(0)
         
         # Should have called extract_message_text for each message  
-        self.assertGreater(mock_extract_text.call_count, 0)
+        self.assertGreater(extract_message_text.call_count, 0)
         
         # Check that extracted text is included
         for msg in new_messages:
@@ -317,15 +318,15 @@ class TestMessagePollingService(unittest.TestCase):
         
         self.assertEqual(synced_count, 0)
     
-    @patch('src.database.polling_service.MessagePollingService.get_new_messages_from_source')
-    @patch('src.database.polling_service.MessagePollingService.sync_new_messages')
-    def test_poll_once_no_new_messages(self, mock_sync, mock_get_messages):
+    @patch.multiple('src.database.polling_service.MessagePollingService',
+                    get_new_messages_from_source=DEFAULT, sync_new_messages=DEFAULT)
+    def test_poll_once_no_new_messages(self, get_new_messages_from_source, sync_new_messages):
         """Test polling cycle with no new messages"""
         # Initialize polling state
         self.polling_service.initialize()
         
         # Mock no new messages
-        mock_get_messages.return_value = []
+        get_new_messages_from_source.return_value = []
         
         result = self.polling_service.poll_once()
         
@@ -334,11 +335,11 @@ class TestMessagePollingService(unittest.TestCase):
         self.assertEqual(result["synced_messages"], 0)
         
         # sync_new_messages should not be called
-        mock_sync.assert_not_called()
+        sync_new_messages.assert_not_called()
     
-    @patch('src.database.polling_service.MessagePollingService.get_new_messages_from_source')
-    @patch('src.database.polling_service.MessagePollingService.sync_new_messages')
-    def test_poll_once_with_new_messages(self, mock_sync, mock_get_messages):
+    @patch.multiple('src.database.polling_service.MessagePollingService',
+                    get_new_messages_from_source=DEFAULT, sync_new_messages=DEFAULT)
+    def test_poll_once_with_new_messages(self, get_new_messages_from_source, sync_new_messages):
         """Test polling cycle with new messages"""
         # Initialize polling state
         self.polling_service.initialize()
@@ -348,8 +349,8 @@ class TestMessagePollingService(unittest.TestCase):
             {"rowid": 1, "text": "Hello"},
             {"rowid": 2, "text": "World"}
         ]
-        mock_get_messages.return_value = test_messages
-        mock_sync.return_value = 2
+        get_new_messages_from_source.return_value = test_messages
+        sync_new_messages.return_value = 2
         
         result = self.polling_service.poll_once()
         
@@ -414,6 +415,21 @@ class TestMessagePollingService(unittest.TestCase):
         self.polling_service.stop_polling()
         self.assertFalse(self.polling_service.is_running)
 
+    def test_start_polling_closes_connection_when_stopped(self):
+        """Test that the polling loop closes its database connection on exit"""
+        self.polling_service.initialize()
+
+        def poll_and_stop():
+            self.polling_service.stop_polling()
+            return {"success": True}
+
+        with patch.object(self.polling_service, "poll_once", side_effect=poll_and_stop):
+            self.polling_service.start_polling()
+
+        self.assertIsNone(self.polling_service.messages_db._local.conn)
+        state = self.messages_db.get_polling_state()
+        self.assertEqual(state["sync_status"], "stopped")
+
 
 class TestPollingServiceIntegration(unittest.TestCase):
     """Integration tests for polling service with real database operations"""
@@ -430,6 +446,7 @@ class TestPollingServiceIntegration(unittest.TestCase):
     def tearDown(self):
         """Clean up integration test environment"""
         import shutil
+        self.polling_service.close()
         shutil.rmtree(self.test_dir, ignore_errors=True)
     
     def test_end_to_end_initialization(self):
@@ -1,12 +1,6 @@
 #!/usr/bin/env python3
 """Test script for enhanced database manager with text extraction"""
 
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
-
 from src.database.manager import DatabaseManager
 from src.utils.logger_config import setup_logging
 
@@ -3,6 +3,7 @@
 import unittest
 import tempfile
 import sqlite3
+import threading
 from pathlib import Path
 
 from src.database.messages_db import MessagesDatabase
@@ -52,6 +53,7 @@ class TestMessagesDatabase(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test fixtures"""
+        self.db.close()
         if self.test_db_path.exists():
             self.test_db_path.unlink()
 
@@ -67,6 +69,30 @@ class TestMessagesDatabase(unittest.TestCase):
         self.assertTrue(self.db.create_database())  # Should not fail
         self.assertTrue(self.db.table_exists("users"))
 
+    def test_connection_reused_per_thread(self):
+        """Test that calls on one thread share a connection until close()"""
+        conn = self.db._connect()
+        self.assertIs(self.db._connect(), conn)
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(self.db._connect()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], conn)
+
+        self.db.close()
+        self.assertIsNot(self.db._connect(), conn)
+
+    def test_context_manager_closes_connection(self):
+        """Test that leaving a with block closes this thread's connection"""
+        with self.db as db:
+            self.assertIs(db, self.db)
+            conn = db._connect()
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        self.assertIsNot(self.db._connect(), conn)
+
     def test_database_exists_false_initially(self):
         """Test that database_exists returns False before creation"""
         self.assertFalse(self.db.database_exists())
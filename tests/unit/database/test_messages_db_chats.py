@@ -2,37 +2,17 @@
 """Unit tests for MessagesDatabase chat functionality"""
 
 import sqlite3
-import tempfile
 import unittest
-from pathlib import Path
-import sys
-
-# Add the project root to the path so we can import our modules
-sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+from unittest.mock import patch
 
 from src.database.messages_db import MessagesDatabase
+from src.user.user import User
+from tests.memory_db import MemoryDatabaseTestCase
 
 
-class TestMessagesDatabaseChats(unittest.TestCase):
+class TestMessagesDatabaseChats(MemoryDatabaseTestCase):
     """Unit tests for chat-related functionality in MessagesDatabase"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        # Create a temporary database for testing
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-        self.temp_db.close()
-        self.db_path = self.temp_db.name
-
-        self.messages_db = MessagesDatabase(self.db_path)
-
-        # Create the database and tables
-        self.assertTrue(self.messages_db.create_database())
-
-    def tearDown(self):
-        """Clean up test fixtures"""
-        # Remove the temporary database file
-        Path(self.db_path).unlink(missing_ok=True)
-
     def test_database_creation_includes_chats_table(self):
         """Test that create_database() creates chats table"""
         # Check that chats table exists
@@ -64,7 +44,7 @@ class TestMessagesDatabaseChats(unittest.TestCase):
 
     def test_chats_table_indexes(self):
         """Test that proper indexes are created for chats and chat_users tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite3.connect(self.db_path, uri=True) as conn:
             cursor = conn.cursor()
 
             # Check for chats table indexes
@@ -172,10 +152,11 @@ class TestMessagesDatabaseChats(unittest.TestCase):
         count = self.messages_db.insert_chats_batch(chats)
         self.assertEqual(count, 3)
 
-        # Verify all chats were inserted
+        # Verify all chats were inserted, fetched in one lookup
+        fetched = self.messages_db.get_chats_by_ids([c["chat_id"] for c in chats])
+        self.assertEqual(len(fetched), len(chats))
         for chat_data in chats:
-            chat = self.messages_db.get_chat_by_id(chat_data["chat_id"])
-            self.assertIsNotNone(chat)
+            chat = fetched[chat_data["chat_id"]]
             self.assertEqual(chat["display_name"], chat_data["display_name"])
             self.assertEqual(chat["user_ids"], chat_data["user_ids"])
 
@@ -255,6 +236,33 @@ class TestMessagesDatabaseChats(unittest.TestCase):
         chats = self.messages_db.get_all_chats(limit=3)
         self.assertEqual(len(chats), 3)
 
+    def test_get_all_chats_user_ids_across_batches(self):
+        """Test user_ids stay matched to their chats when lookups are split into batches"""
+        test_chats = [
+            {"chat_id": 20040 + i, "display_name": f"Chat {i}", "user_ids": [f"u{i}", f"v{i}"]}
+            for i in range(5)
+        ]
+        test_chats.append({"chat_id": 20045, "display_name": "No users", "user_ids": []})
+        self.messages_db.insert_chats_batch(test_chats)
+
+        with patch("src.database.messages_db.SQLITE_MAX_PARAMS", 2):
+            chats = self.messages_db.get_all_chats()
+
+        self.assertEqual(
+            {chat["chat_id"]: chat["user_ids"] for chat in chats},
+            {chat["chat_id"]: chat["user_ids"] for chat in test_chats},
+        )
+
+    def test_insert_chat_users_across_statements(self):
+        """Test chat users split over several multi-row INSERTs are all stored"""
+        user_ids = [f"u{i}" for i in range(5)]
+
+        # Two rows per statement: 5 users need three INSERTs
+        with patch("src.database.messages_db.SQLITE_MAX_PARAMS", 4):
+            self.assertTrue(self.messages_db.insert_chat(20050, "Many users", user_ids))
+
+        self.assertEqual(self.messages_db.get_chat_by_id(20050)["user_ids"], user_ids)
+
     def test_clear_chats_table_empty(self):
         """Test clearing empty chats table"""
         result = self.messages_db.clear_chats_table()
@@ -291,7 +299,7 @@ class TestMessagesDatabaseChats(unittest.TestCase):
         self.assertTrue(result)
 
         # Check raw storage in chat_users table
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite3.connect(self.db_path, uri=True) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT user_id FROM chat_users WHERE chat_id = ? ORDER BY user_id",
@@ -461,15 +469,12 @@ class TestMessagesDatabaseChats(unittest.TestCase):
     def test_get_chat_users_with_details(self):
         """Test getting full user details for chat participants"""
         # First create some users in the users table
-        from src.user.user import User
-
         test_users = [
             User("user1", "John", "Doe", "+1234567890", "john@example.com", None),
             User("user2", "Jane", "Smith", "+9876543210", "jane@example.com", None),
         ]
 
-        for user in test_users:
-            self.messages_db.insert_user(user)
+        self.messages_db.insert_users_batch(test_users)
 
         # Create a chat with these users
         chat_id = 20034
@@ -105,8 +105,7 @@ class TestMessagesDatabaseHandleId(unittest.TestCase):
             User("user-3", "Bob", "Wilson", "(555) 555-5555", "bob@example.com", None),
         ]
 
-        for user in users:
-            self.db.insert_user(user)
+        self.db.insert_users_batch(users)
 
         # Test retrieving by handle_id
         user_100 = self.db.get_user_by_handle_id(100)
@@ -185,8 +184,7 @@ class TestMessagesDatabaseHandleId(unittest.TestCase):
             User("user-2", "Jane", "Smith", "(555) 987-6543", "jane@example.com", None),
         ]
 
-        for user in users:
-            self.db.insert_user(user)
+        self.db.insert_users_batch(users)
 
         all_users = self.db.get_all_users()
         self.assertEqual(len(all_users), 2)
@@ -229,8 +227,7 @@ class TestMessagesDatabaseHandleId(unittest.TestCase):
             User("user-3", "Bob", "Wilson", "", "bob@example.com", None),
         ]
 
-        for user in users:
-            self.db.insert_user(user)
+        self.db.insert_users_batch(users)
 
         stats = self.db.get_database_stats()
 
@@ -1,6 +1,10 @@
 """Tests for AddressBookExtractor"""
 
+import sqlite3
+import tempfile
 import unittest
+from pathlib import Path
+
 from src.extractors.addressbook_extractor import AddressBookExtractor
 from src.user.user import User
 
@@ -22,6 +26,11 @@ class TestAddressBookExtractor(unittest.TestCase):
         result = self.extractor._normalize_phone("15551234567")
         self.assertEqual(result, "(555) 123-4567")
 
+    def test_normalize_phone_eleven_digits_without_country_code(self):
+        """Test that 11-digit numbers without US country code are unchanged"""
+        result = self.extractor._normalize_phone("+7 912 345 6789")
+        self.assertEqual(result, "+7 912 345 6789")
+
     def test_normalize_phone_formatted(self):
         """Test phone number normalization with existing formatting"""
         result = self.extractor._normalize_phone("(555) 123-4567")
@@ -104,5 +113,142 @@ class TestAddressBookExtractor(unittest.TestCase):
             self.skipTest(f"Address book extraction failed: {e}")
 
 
+def create_addressbook_database(db_path, contacts):
+    """Create a minimal AddressBook database with the given contacts
+
+    Each contact is a (first_name, last_name, phones, emails) tuple.
+    """
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE ZABCDRECORD (
+                Z_PK INTEGER PRIMARY KEY, ZFIRSTNAME TEXT, ZLASTNAME TEXT
+            );
+            CREATE TABLE ZABCDPHONENUMBER (
+                Z_PK INTEGER PRIMARY KEY, ZOWNER INTEGER, ZFULLNUMBER TEXT,
+                ZISPRIMARY INTEGER
+            );
+            CREATE TABLE ZABCDEMAILADDRESS (
+                Z_PK INTEGER PRIMARY KEY, ZOWNER INTEGER, ZADDRESS TEXT,
+                ZISPRIMARY INTEGER
+            );
+            """
+        )
+        for z_pk, (first_name, last_name, phones, emails) in enumerate(
+            contacts, start=1
+        ):
+            conn.execute(
+                "INSERT INTO ZABCDRECORD VALUES (?, ?, ?)",
+                (z_pk, first_name, last_name),
+            )
+            conn.executemany(
+                "INSERT INTO ZABCDPHONENUMBER (ZOWNER, ZFULLNUMBER, ZISPRIMARY) "
+                "VALUES (?, ?, ?)",
+                [(z_pk, phone, int(i == 0)) for i, phone in enumerate(phones)],
+            )
+            conn.executemany(
+                "INSERT INTO ZABCDEMAILADDRESS (ZOWNER, ZADDRESS, ZISPRIMARY) "
+                "VALUES (?, ?, ?)",
+                [(z_pk, email, int(i == 0)) for i, email in enumerate(emails)],
+            )
+
+
+class TestAddressBookExtractorWithDatabase(unittest.TestCase):
+    """Test cases for AddressBookExtractor against a synthetic AddressBook"""
+
+    def setUp(self):
+        """Set up a temporary AddressBook directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+
+        self.extractor = AddressBookExtractor()
+        self.extractor.addressbook_root = root
+        self.extractor.sources_dir = root / "Sources"
+
+        self.main_db = root / "AddressBook-v22.abcddb"
+        create_addressbook_database(
+            self.main_db,
+            [
+                ("John", "Doe", ["15551234567"], ["John@Example.com"]),
+                ("Jane", "Smith", [], ["jane@example.com"]),
+                ("No", "Contact", [], []),
+            ],
+        )
+
+    def tearDown(self):
+        """Clean up the temporary AddressBook directory"""
+        self.temp_dir.cleanup()
+
+    def test_connect_is_read_only(self):
+        """Test that extraction connections cannot write"""
+        conn = self.extractor._connect(self.main_db)
+        try:
+            with self.assertRaises(sqlite3.Error):
+                conn.execute("DELETE FROM ZABCDRECORD")
+        finally:
+            conn.close()
+
+    def test_extract_users(self):
+        """Test extracting users from the synthetic database"""
+        users = self.extractor.extract_users()
+
+        self.assertEqual(
+            sorted((u.first_name, u.phone_number, u.email) for u in users),
+            [
+                ("Jane", "", "jane@example.com"),
+                ("John", "(555) 123-4567", "john@example.com"),
+            ],
+        )
+
+    def test_extract_users_prefers_primary_contact_methods(self):
+        """Test that the primary phone and email are chosen per contact"""
+        source_dir = self.extractor.sources_dir / "source-a"
+        source_dir.mkdir(parents=True)
+        create_addressbook_database(
+            source_dir / "AddressBook-v22.abcddb",
+            [
+                (
+                    "Alice",
+                    "Brown",
+                    ["5550000001", "5550000002"],
+                    ["alice@home.com", "alice@work.com"],
+                )
+            ],
+        )
+
+        users = self.extractor.extract_users()
+        alice = next(u for u in users if u.first_name == "Alice")
+
+        self.assertEqual(alice.phone_number, "(555) 000-0001")
+        self.assertEqual(alice.email, "alice@home.com")
+
+    def test_extract_users_deduplicates_across_sources(self):
+        """Test that contacts repeated in source databases are merged"""
+        for name, contacts in [
+            ("source-a", [("John", "Doe", ["15551234567"], ["john@example.com"])]),
+            ("source-b", [("Bob", "Jones", ["5559876543"], [])]),
+        ]:
+            source_dir = self.extractor.sources_dir / name
+            source_dir.mkdir(parents=True)
+            create_addressbook_database(
+                source_dir / "AddressBook-v22.abcddb", contacts
+            )
+
+        users = self.extractor.extract_users()
+
+        self.assertEqual(
+            sorted(u.first_name for u in users), ["Bob", "Jane", "John"]
+        )
+
+    def test_get_extraction_stats(self):
+        """Test extraction statistics for the synthetic database"""
+        stats = self.extractor.get_extraction_stats()
+
+        self.assertEqual(stats["total_databases"], 1)
+        self.assertEqual(stats["total_records"], 3)
+        self.assertEqual(stats["records_with_phone"], 1)
+        self.assertEqual(stats["records_with_email"], 2)
+
+
 if __name__ == "__main__":
     unittest.main()
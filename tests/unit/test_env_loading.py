@@ -4,15 +4,11 @@ Unit tests for environment variable loading in test_message_maker.py
 """
 
 import os
-import sys
 import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
-
 
 class TestEnvLoading(unittest.TestCase):
     """Test environment variable loading functionality."""
@@ -15,36 +15,35 @@ from src.message_maker.types import LLMPromptData, MessageResponse, ChatMessage,
 class TestLLMClient:
     """Test cases for LLMClient class."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.api_key = "test-api-key"
-        self.sample_chat_history = [
-            ChatMessage(
-                contents="Hey, how's it going?",
-                is_from_me=True,
-                created_at="2023-01-01T10:00:00Z"
-            ),
-            ChatMessage(
-                contents="Pretty good! Just working on some projects.",
-                is_from_me=False,
-                created_at="2023-01-01T10:05:00Z"
-            ),
-            ChatMessage(
-                contents="Nice! What kind of projects?",
-                is_from_me=True,
-                created_at="2023-01-01T10:06:00Z"
-            )
-        ]
-        self.sample_new_message = NewMessage(
-            contents="I'm building a messaging AI assistant",
-            created_at="2023-01-01T10:10:00Z"
-        )
-        self.sample_prompt_data = LLMPromptData(
-            system_prompt=SYSTEM_PROMPT,
-            user_prompt="test prompt",
-            chat_history=self.sample_chat_history,
-            new_message=self.sample_new_message
+    # Shared test data; no test mutates it, so it is built once per class
+    api_key = "test-api-key"
+    sample_chat_history = [
+        ChatMessage(
+            contents="Hey, how's it going?",
+            is_from_me=True,
+            created_at="2023-01-01T10:00:00Z"
+        ),
+        ChatMessage(
+            contents="Pretty good! Just working on some projects.",
+            is_from_me=False,
+            created_at="2023-01-01T10:05:00Z"
+        ),
+        ChatMessage(
+            contents="Nice! What kind of projects?",
+            is_from_me=True,
+            created_at="2023-01-01T10:06:00Z"
         )
+    ]
+    sample_new_message = NewMessage(
+        contents="I'm building a messaging AI assistant",
+        created_at="2023-01-01T10:10:00Z"
+    )
+    sample_prompt_data = LLMPromptData(
+        system_prompt=SYSTEM_PROMPT,
+        user_prompt="test prompt",
+        chat_history=sample_chat_history,
+        new_message=sample_new_message
+    )
     
     def test_init_with_api_key(self):
         """Test client initialization with provided API key."""
@@ -258,9 +257,7 @@ class TestLLMClient:
 class TestLLMClientIntegration:
     """Integration-style tests for LLMClient."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.api_key = "test-api-key"
+    api_key = "test-api-key"
     
     @patch('src.message_maker.llm_client.anthropic.Anthropic')
     def test_end_to_end_response_generation(self, mock_anthropic_class):
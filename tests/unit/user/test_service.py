@@ -4,19 +4,34 @@ Unit tests for UserService
 """
 
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 from src.user.service import UserService
 from src.user.user import User
 
 
+class _StubDB:
+    """Minimal stand-in for MessagesDatabase that records user lookups"""
+
+    def __init__(self, user=None, exc=None):
+        self.user = user
+        self.exc = exc
+        self.calls = []
+
+    def get_user_by_id(self, user_id):
+        self.calls.append(user_id)
+        if self.exc:
+            raise self.exc
+        return self.user
+
+
 class TestUserService(unittest.TestCase):
     """Test UserService functionality."""
 
     def setUp(self):
         """Set up test environment."""
-        self.mock_db = Mock()
-        self.service = UserService(db=self.mock_db)
+        self.stub_db = _StubDB()
+        self.service = UserService(db=self.stub_db)
 
     def test_get_user_by_id_success(self):
         """Test successful user lookup by ID."""
@@ -29,32 +44,32 @@ class TestUserService(unittest.TestCase):
             email="john.doe@example.com"
         )
         
-        # Mock database response
-        self.mock_db.get_user_by_id.return_value = mock_user
+        # Stub database response
+        self.stub_db.user = mock_user
         
         # Test the service
         result = self.service.get_user_by_id("test-user-123")
         
         # Verify
         self.assertEqual(result, mock_user)
-        self.mock_db.get_user_by_id.assert_called_once_with("test-user-123")
+        self.assertEqual(self.stub_db.calls, ["test-user-123"])
 
     def test_get_user_by_id_not_found(self):
         """Test user lookup when user not found."""
-        # Mock database response
-        self.mock_db.get_user_by_id.return_value = None
+        # Stub database response
+        self.stub_db.user = None
         
         # Test the service
         result = self.service.get_user_by_id("nonexistent-user")
         
         # Verify
         self.assertIsNone(result)
-        self.mock_db.get_user_by_id.assert_called_once_with("nonexistent-user")
+        self.assertEqual(self.stub_db.calls, ["nonexistent-user"])
 
     def test_get_user_by_id_database_error(self):
         """Test user lookup when database raises exception."""
-        # Mock database to raise exception
-        self.mock_db.get_user_by_id.side_effect = Exception("Database error")
+        # Stub database to raise exception
+        self.stub_db.exc = Exception("Database error")
         
         # Test that exception is re-raised
         with self.assertRaises(Exception):
@@ -71,7 +86,7 @@ class TestUserService(unittest.TestCase):
             email="john.doe@example.com"
         )
         
-        self.mock_db.get_user_by_id.return_value = mock_user
+        self.stub_db.user = mock_user
         
         # Test the service
         result = self.service.get_user_phone_number("test-user-123")
@@ -79,9 +94,43 @@ class TestUserService(unittest.TestCase):
         # Verify formatted phone number is returned
         self.assertEqual(result, "+15551234567")
 
+    def test_get_user_phone_number_success_output(self):
+        """Test phone number retrieval reports the formatted number."""
+        self.stub_db.user = User(
+            user_id="test-user-123",
+            first_name="John",
+            last_name="Doe",
+            phone_number="555-123-4567",
+            email="john.doe@example.com"
+        )
+
+        # Capture the service's log output directly rather than mocking it
+        with self.assertLogs("src.user.service", level="INFO") as captured:
+            self.service.get_user_phone_number("test-user-123")
+
+        self.assertIn(
+            "Retrieved phone number for John Doe: +15551234567",
+            "\n".join(captured.output),
+        )
+
+    def test_get_user_phone_number_no_phone_output(self):
+        """Test phone number retrieval warns when the user has no phone."""
+        self.stub_db.user = User(
+            user_id="test-user-123",
+            first_name="John",
+            last_name="Doe",
+            phone_number="",
+            email="john.doe@example.com"
+        )
+
+        with self.assertLogs("src.user.service", level="WARNING") as captured:
+            self.service.get_user_phone_number("test-user-123")
+
+        self.assertIn("No phone number for user: John Doe", "\n".join(captured.output))
+
     def test_get_user_phone_number_user_not_found(self):
         """Test phone number retrieval when user not found."""
-        self.mock_db.get_user_by_id.return_value = None
+        self.stub_db.user = None
         
         result = self.service.get_user_phone_number("nonexistent-user")
         
@@ -98,7 +147,7 @@ class TestUserService(unittest.TestCase):
             email="john.doe@example.com"
         )
         
-        self.mock_db.get_user_by_id.return_value = mock_user
+        self.stub_db.user = mock_user
         
         result = self.service.get_user_phone_number("test-user-123")
         
@@ -167,7 +216,7 @@ class TestUserService(unittest.TestCase):
             email="john.doe@example.com"
         )
         
-        self.mock_db.get_user_by_id.return_value = mock_user
+        self.stub_db.user = mock_user
         
         user, phone = self.service.get_user_for_messaging("test-user-123")
         
@@ -176,7 +225,7 @@ class TestUserService(unittest.TestCase):
 
     def test_get_user_for_messaging_not_found(self):
         """Test user and phone retrieval when user not found."""
-        self.mock_db.get_user_by_id.return_value = None
+        self.stub_db.user = None
         
         user, phone = self.service.get_user_for_messaging("nonexistent-user")
         
@@ -1,5 +1,6 @@
 """Tests for User class and AddressBookExtractor"""
 
+import json
 import unittest
 import tempfile
 import sqlite3
@@ -163,6 +164,33 @@ class TestUser(unittest.TestCase):
         with self.assertRaises(ValueError):
             User.from_address_book_record(first_name="Invalid", last_name="User")
 
+    def test_from_address_book_record_invalid_no_name(self):
+        """Test that creation fails without any name"""
+        with self.assertRaises(ValueError):
+            User.from_address_book_record(
+                first_name="", last_name="", phone_number="(555) 111-2222"
+            )
+
+    def test_from_address_book_record_equals_constructor(self):
+        """Test that the fast path builds the same user as the constructor"""
+        user = User.from_address_book_record(
+            first_name="Jane",
+            last_name="Smith",
+            phone_number="(555) 987-6543",
+            user_id="user-1",
+        )
+
+        self.assertEqual(
+            user,
+            User(
+                user_id="user-1",
+                first_name="Jane",
+                last_name="Smith",
+                phone_number="(555) 987-6543",
+                email="",
+            ),
+        )
+
     def test_to_dict(self):
         """Test converting user to dictionary"""
         user = User(
@@ -184,6 +212,31 @@ class TestUser(unittest.TestCase):
 
         self.assertEqual(user.to_dict(), expected_dict)
 
+    def test_to_dict_plain_dict(self):
+        """Test that to_dict returns a JSON-serializable dict that tracks field changes"""
+        user = User(
+            user_id="test-123",
+            first_name="John",
+            last_name="Doe",
+            phone_number="(555) 123-4567",
+            email="john@example.com",
+        )
+
+        user_dict = user.to_dict()
+        self.assertIs(type(user_dict), dict)
+        self.assertEqual(json.loads(json.dumps(user_dict)), user_dict)
+
+        user.handle_id = 42
+        self.assertEqual(user.to_dict()["handle_id"], 42)
+
+    def test_user_is_slotted(self):
+        """Test that users carry no per-instance __dict__"""
+        user = User.from_address_book_record(
+            first_name="John", last_name="Doe", phone_number="(555) 123-4567"
+        )
+
+        self.assertFalse(hasattr(user, "__dict__"))
+
     def test_str_representation_full(self):
         """Test string representation with both phone and email"""
         user = User(